@@ -11,6 +11,8 @@ from app.report.views.api import router as view_router
 from app.report.clients.api import router as client_router
 from app.report.deals.api import router as deal_router
 from app.report.Accounting.api import router as accounting_router
+from app.report.analytics.api import router as analytics_router
+from app.saved_search.api import router as saved_search_router
 
 router = APIRouter()
 
@@ -26,4 +28,6 @@ router.include_router(view_router, prefix='/views', tags=["Views"])
 router.include_router(client_router, prefix='/clients', tags=["Clients"])
 router.include_router(deal_router, prefix='/deals', tags=["Deals"])
 router.include_router(accounting_router, prefix='/accounting', tags=["Accounting"])
+router.include_router(analytics_router, prefix='/analytics', tags=["Analytics"])
+router.include_router(saved_search_router, prefix='/saved_searches', tags=["Saved searches"])
 
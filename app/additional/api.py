@@ -1,14 +1,20 @@
 from typing import List
 
-from fastapi import HTTPException, status, Depends, APIRouter, Query
+from fastapi import HTTPException, status, Depends, APIRouter, Query, BackgroundTasks, File, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.additional.bulk_import import import_objects
+from app.additional.export import export_objects
 from app.additional.media_crud import delete_media, get_media_by_id, get_media
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
+from app.config import SEARCH_MAX_LIMIT
 from app.database import get_async_session
-from app.additional.search import search, get_all_object
+from app.additional.search import search, stream_search, get_all_object
 from app.additional.filter import filter_objects
+from app.additional.suggest import suggest
+from app.utils.serialization import ORJSONResponse
 from app.object.models import ActionType, HouseType, BathroomType, CurrentStatus, HouseCondition, LocationCommercial, \
     LocationLand
 
@@ -21,9 +27,47 @@ async def search_endpoint(
         db: AsyncSession = Depends(get_async_session),
         text: str = Query(..., title="Search text", description="Text to search"),
         table: str = Query(..., title="Table name", description="Table name to search",
-                           examples=["land", "apartment", "commercial"])
+                           examples=["land", "apartment", "commercial", "all"]),
+        limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT, title="Limit", description="Limit of objects to get"),
+        page: int = Query(1, ge=1, title="Page", description="Page number"),
+        cursor: str = Query(None, title="Cursor", description="next_cursor from the previous response. Used instead of page"),
+        mode: str = Query("fts", title="Search mode", description="fts - full-text search, fuzzy - typo tolerant",
+                          examples=["fts", "fuzzy"]),
+        threshold: float = Query(0.3, ge=0, le=1, title="Threshold", description="Min similarity for fuzzy mode"),
+        stream: bool = Query(False, title="Stream", description="Stream every match as NDJSON instead of one page"),
+        fields: List[str] = Query(None, title="Fields", description="Columns to return instead of the full object. 'card' for a list card",
+                                  examples=[["card"], ["title", "price", "district"]])
+):
+    if stream:
+        return StreamingResponse(stream_search(text, table, mode, threshold, fields), media_type="application/x-ndjson")
+    return ORJSONResponse(await search(db, text, table, limit, page, mode, threshold, cursor, fields))
+
+
+@router.get("/suggest/")
+async def suggest_endpoint(
+        current_user: UserRead = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_async_session),
+        text: str = Query(..., min_length=1, title="Search text", description="Typed prefix of crm id, title or district"),
+        table: str = Query(None, title="Table name", description="Table name to suggest from. All tables if empty",
+                           examples=["land", "apartment", "commercial"]),
+        limit: int = Query(10, ge=1, le=50, title="Limit", description="Limit of suggestions to get")
 ):
-    return await search(db, text, table)
+    if table and table not in ("land", "apartment", "commercial"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid table name")
+    return await suggest(db, text, table, limit)
+
+
+@router.post("/import/")
+async def import_objects_endpoint(
+        background_tasks: BackgroundTasks,
+        current_user: UserRead = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_async_session),
+        table: str = Query(..., title="Table name", description="Table name to import into",
+                           examples=["land", "apartment", "commercial"]),
+        file: UploadFile = File(..., description="CSV or XLSX file, one object per row, columns named as in create"),
+        post_to_channel: bool = Query(False, title="Post to channel", description="Post created objects to Telegram")
+):
+    return ORJSONResponse(await import_objects(db, table, file, current_user, background_tasks, post_to_channel))
 
 
 @router.delete("/delete_media/")
@@ -68,17 +112,12 @@ async def get_all_object_endpoint(
     return await get_all_object(db)
 
 
-@router.get("/filter/")
-async def filter_objects_endpoint(
-        # current_user: UserRead = Depends(get_current_active_user),
-        db: AsyncSession = Depends(get_async_session),
-        table: str = Query(..., title="Table name", description="Table name to filter",
-                           examples=["land", "apartment", "commercial"]),
-        action_type: ActionType = Query(None, title="Action type", description="Action type. Each one"),
-        district: str = Query(None, title="District", description="District name. Each one"),
-        metro_st: str = Query(None, title="Metro station", description="Metro station name. Only apart"),
+def filter_parameters(
+        action_type: List[ActionType] = Query(None, title="Action type", description="Action type. Each one. Repeat for several"),
+        district: List[str] = Query(None, title="District", description="District name. Each one. Repeat for several"),
+        metro_st: List[str] = Query(None, title="Metro station", description="Metro station name. Only apart. Repeat for several"),
         furniture: bool = Query(None, title="Furniture", description="Furniture availability. Each one"),
-        bathroom: BathroomType = Query(None, title="Bathroom", description="Bathroom type. Only apart"),
+        bathroom: List[BathroomType] = Query(None, title="Bathroom", description="Bathroom type. Only apart. Repeat for several"),
         price_min: int = Query(None, title="Min price", description="Min price. Each one"),
         price_max: int = Query(None, title="Max price", description="Max price. Each one"),
         room_min: int = Query(None, title="Min rooms", description="Min rooms. Each one"),
@@ -89,44 +128,78 @@ async def filter_objects_endpoint(
         floor_max: int = Query(None, title="Max floor", description="Max floor. Each one"),
         date_min: str = Query(None, title="Min date", description="Min date. Each one"),
         date_max: str = Query(None, title="Max date", description="Max date. Each one"),
-        current_status: CurrentStatus = Query(None, title="Current status", description="Current status. Each one"),
+        current_status: List[CurrentStatus] = Query(None, title="Current status", description="Current status. Each one. Repeat for several"),
         status_date_min: str = Query(None, title="Min status date", description="Min status date. Each one"),
         status_date_max: str = Query(None, title="Max status date", description="Max status date. Each one"),
-        house_type: HouseType = Query(None, title="House type", description="House type. Only apart"),
-        house_condition: HouseCondition = Query(None, title="House condition", description="House condition. Each one"),
-        location_commercial: LocationCommercial = Query(None, title="Commercial location", description="Commercial location. Only comm"),
-        location_land: LocationLand = Query(None, title="Land location", description="Land location. Only land"),
+        house_type: List[HouseType] = Query(None, title="House type", description="House type. Only apart. Repeat for several"),
+        house_condition: List[HouseCondition] = Query(None, title="House condition", description="House condition. Each one. Repeat for several"),
+        location_commercial: List[LocationCommercial] = Query(None, title="Commercial location", description="Commercial location. Only comm. Repeat for several"),
+        location_land: List[LocationLand] = Query(None, title="Land location", description="Land location. Only land. Repeat for several"),
         parking_place: bool = Query(None, title="Parking place", description="Parking place availability. Only comm and land"),
-        responsible: str = Query(None, title="Responsible", description="Responsible name. Each one"),
+        responsible: List[str] = Query(None, title="Responsible", description="Responsible name. Each one. Repeat for several")
+) -> dict:
+    return {
+        "action_type": action_type if action_type else None,
+        "district": district if district else None,
+        "metro_st": metro_st if metro_st else None,
+        "furniture": furniture if furniture else None,
+        "bathroom": bathroom if bathroom else None,
+        "price_min": price_min if price_min else None,
+        "price_max": price_max if price_max else None,
+        "room_min": room_min if room_min else None,
+        "room_max": room_max if room_max else None,
+        "area_min": area_min if area_min else None,
+        "area_max": area_max if area_max else None,
+        "floor_min": floor_min if floor_min else None,
+        "floor_max": floor_max if floor_max else None,
+        "date_min": date_min if date_min else None,
+        "date_max": date_max if date_max else None,
+        "current_status": current_status if current_status else None,
+        "status_date_min": status_date_min if status_date_min else None,
+        "status_date_max": status_date_max if status_date_max else None,
+        "house_type": house_type if house_type else None,
+        "house_condition": house_condition if house_condition else None,
+        "location_commercial": location_commercial if location_commercial else None,
+        "location_land": location_land if location_land else None,
+        "parking_place": parking_place if parking_place else None,
+        "responsible": responsible if responsible else None,
+    }
+
+
+@router.get("/filter/")
+async def filter_objects_endpoint(
+        # current_user: UserRead = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_async_session),
+        table: str = Query(..., title="Table name", description="Table name to filter",
+                           examples=["land", "apartment", "commercial", "all"]),
+        filters: dict = Depends(filter_parameters),
         limit: int = Query(None, title="Limit", description="Limit of objects to get"),
-        page: int = Query(None, title="Page", description="Page number")
+        page: int = Query(None, title="Page", description="Page number"),
+        cursor: str = Query(None, title="Cursor", description="next_cursor from the previous response. Used instead of page"),
+        facets: List[str] = Query(None, title="Facets", description="Facets to count over the filtered objects",
+                                  examples=[["district", "rooms", "house_condition", "current_status", "price"]]),
+        fields: List[str] = Query(None, title="Fields", description="Columns to return instead of the full object. 'card' for a list card",
+                                  examples=[["card"], ["title", "price", "district"]])
 ):
-    return await filter_objects(
-        db=db, table=table,
-        district=district if district else None,
-        action_type=action_type if action_type else None,
-        metro_st=metro_st if metro_st else None,
-        furniture=furniture if furniture else None,
-        bathroom=bathroom if bathroom else None,
-        price_min=price_min if price_min else None,
-        price_max=price_max if price_max else None,
-        room_min=room_min if room_min else None,
-        room_max=room_max if room_max else None,
-        area_min=area_min if area_min else None,
-        area_max=area_max if area_max else None,
-        floor_min=floor_min if floor_min else None,
-        floor_max=floor_max if floor_max else None,
-        date_min=date_min if date_min else None,
-        date_max=date_max if date_max else None,
-        current_status=current_status if current_status else None,
-        status_date_min=status_date_min if status_date_min else None,
-        status_date_max=status_date_max if status_date_max else None,
-        house_type=house_type if house_type else None,
-        house_condition=house_condition if house_condition else None,
-        location_commercial=location_commercial if location_commercial else None,
-        location_land=location_land if location_land else None,
-        parking_place=parking_place if parking_place else None,
-        responsible=responsible if responsible else None,
+    return ORJSONResponse(await filter_objects(
+        db=db, table=table, **filters,
         limit=limit if limit else None,
-        page=page if page else None
-    )
+        page=page if page else None,
+        cursor=cursor if cursor else None,
+        facets=facets if facets else None,
+        fields=fields if fields else None
+    ))
+
+
+@router.get("/export/")
+async def export_objects_endpoint(
+        current_user: UserRead = Depends(get_current_active_user),
+        table: str = Query(..., title="Table name", description="Table name to export",
+                           examples=["land", "apartment", "commercial", "all"]),
+        export_format: str = Query("csv", alias="format", title="Format", description="File format",
+                                   examples=["csv", "xlsx"]),
+        filters: dict = Depends(filter_parameters),
+        fields: List[str] = Query(None, title="Fields", description="Columns to export. Every column if empty",
+                                  examples=[["card"], ["title", "price", "district"]])
+):
+    return export_objects(table, export_format, filters, fields if fields else None)
@@ -0,0 +1,128 @@
+import asyncio
+import io
+
+import pandas as pd
+from fastapi import BackgroundTasks, HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.handlers import send_message_to_channel
+from app.config import CHANNEL_RENT_ID, CHANNEL_SALE_ID, IMPORT_MAX_ROWS
+from app.object.functions.validations.validate_apartment import validate_apartment_fields
+from app.object.functions.validations.validate_commercial import validate_commercial_fields
+from app.object.functions.validations.validate_land import validate_land_fields
+from app.object.messages import send_rent_apart, send_sale_apart, send_rent_comm, send_sale_comm, send_rent_land, \
+    send_sale_land
+from app.object.models import ActionType, Category, CurrentStatus
+from app.object.models.apartment import Apartment
+from app.object.models.commercial import Commercial
+from app.object.models.land import Land
+from app.object.schemas.apartment import ApartmentCreate
+from app.object.schemas.commercial import CommercialCreate
+from app.object.schemas.land import LandCreate
+from app.utils.reference_data import district_names, metro_names
+
+import_mapping = {
+    "apartment": (Apartment, ApartmentCreate, validate_apartment_fields, send_rent_apart, send_sale_apart),
+    "land": (Land, LandCreate, validate_land_fields, send_rent_land, send_sale_land),
+    "commercial": (Commercial, CommercialCreate, validate_commercial_fields, send_rent_comm, send_sale_comm),
+}
+
+
+def read_rows(content: bytes, filename: str) -> list[dict]:
+    # Every cell is read as text and left to the schema to convert, so phone numbers keep their "+" and zeros
+    if filename.lower().endswith('.csv'):
+        frame = pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False)
+    elif filename.lower().endswith('.xlsx'):
+        frame = pd.read_excel(io.BytesIO(content), dtype=str, keep_default_na=False)
+    else:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only .csv and .xlsx files are supported")
+
+    frame.columns = [str(column).strip() for column in frame.columns]
+    return [{key: value.strip() for key, value in record.items() if isinstance(value, str) and value.strip()}
+            for record in frame.to_dict('records')]
+
+
+def validation_errors(error: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()]
+
+
+async def import_objects(db: AsyncSession, table: str, file: UploadFile, current_user,
+                         background_tasks: BackgroundTasks, post_to_channel: bool = False):
+    if table not in import_mapping:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid table name")
+    model, schema, validate_fields, send_rent, send_sale = import_mapping[table]
+
+    try:
+        rows = await asyncio.to_thread(read_rows, await file.read(), file.filename or '')
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not read file: {e}")
+    if len(rows) > IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Too many rows, max {IMPORT_MAX_ROWS}")
+
+    districts = await district_names(db, *{row.get('district') for row in rows})
+    metros = await metro_names(db, *{row.get('metro_st') for row in rows})
+
+    errors, objects, row_numbers = [], [], []
+    for index, row in enumerate(rows):
+        # Spreadsheet numbering: the header is row 1
+        row_number = index + 2
+        try:
+            item = schema(**{**row, "category": Category(table)})
+        except ValidationError as e:
+            errors.append({"row": row_number, "errors": validation_errors(e)})
+            continue
+
+        row_errors = []
+        if item.district not in districts:
+            row_errors.append("Район объекта не найден")
+        if getattr(item, 'metro_st', None) and item.metro_st not in metros:
+            row_errors.append("Объект метро не найден")
+        try:
+            validate_fields(item)
+        except HTTPException as e:
+            row_errors.append(e.detail)
+        if row_errors:
+            errors.append({"row": row_number, "errors": row_errors})
+            continue
+
+        item.responsible = current_user.full_name
+        item.agent_commission = item.agent_percent * item.price / 100 if item.agent_percent else None
+        if item.second_responsible and item.second_agent_percent:
+            item.second_agent_commission = item.second_agent_percent * item.price / 100
+        if item.current_status == CurrentStatus.FREE:
+            item.status_date = None
+
+        objects.append(model(**item.model_dump(exclude={'crm_id'})))
+        row_numbers.append(row_number)
+
+    if objects:
+        # One flush sends the rows as batched multi-row INSERT ... RETURNING id, crm_id, and one commit ends it.
+        # Going through the session keeps the change log and the search, count and similar indexes up to date
+        try:
+            db.add_all(objects)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e.orig))
+
+    if post_to_channel:
+        for db_object in objects:
+            if db_object.action_type == ActionType.RENT:
+                message = await send_rent(db_object)
+            else:
+                message = await send_sale(db_object, current_user.phone)
+            background_tasks.add_task(send_message_to_channel, message, [],
+                                      CHANNEL_RENT_ID if db_object.action_type == ActionType.RENT else CHANNEL_SALE_ID)
+
+    return {
+        "total": len(rows),
+        "created": len(objects),
+        "failed": len(errors),
+        "objects": [{"row": row_number, "id": db_object.id, "crm_id": db_object.crm_id}
+                    for row_number, db_object in zip(row_numbers, objects)],
+        "errors": errors,
+    }
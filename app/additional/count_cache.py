@@ -0,0 +1,74 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import COUNT_CACHE_TTL
+from app.utils.commit_changes import track_changes
+
+MAX_CACHED_COUNTS = 1024
+
+# Commits in this process invalidate counts at once; the TTL only covers commits made by other worker processes
+_counts: dict[tuple, tuple[int, float]] = {}
+_in_flight: dict[tuple, asyncio.Future] = {}
+_generation: defaultdict[str, int] = defaultdict(int)
+
+
+def invalidate_counts(table: str):
+    _generation[table] += 1
+    for key in [key for key in _counts if key[0] == table]:
+        del _counts[key]
+
+
+async def cached_count(db: AsyncSession, table: str, filters: tuple, count_stmt):
+    key = (table, filters)
+    while True:
+        cached = _counts.get(key)
+        if cached and time.monotonic() - cached[1] <= COUNT_CACHE_TTL:
+            return cached[0]
+
+        in_flight = _in_flight.get(key)
+        if not in_flight:
+            break
+        try:
+            return await asyncio.shield(in_flight)
+        except asyncio.CancelledError:
+            # The leader was cancelled (e.g. its client disconnected): run the count here instead.
+            # A cancellation of this request itself leaves in_flight untouched and is passed on
+            if not in_flight.cancelled():
+                raise
+
+    generation = _generation[table]
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        count = await db.scalar(count_stmt)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()
+        raise
+    finally:
+        _in_flight.pop(key, None)
+
+    if _generation[table] == generation:
+        _counts.pop(key, None)
+        if len(_counts) >= MAX_CACHED_COUNTS:
+            del _counts[next(iter(_counts))]
+        _counts[key] = (count, time.monotonic())
+    future.set_result(count)
+    return count
+
+
+def invalidate_changed(tables: list[str]):
+    for table in set(tables):
+        invalidate_counts(table)
+    invalidate_counts('all')
+
+
+def register_count_cache_listener(model: Type):
+    track_changes(model, 'changed_tables', lambda target, deleted: target.__tablename__, invalidate_changed)
@@ -0,0 +1,89 @@
+import asyncio
+import csv
+import datetime
+import io
+import tempfile
+from enum import Enum
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy import inspect
+
+from app.additional.filter import filter_statement
+from app.config import EXPORT_CHUNK
+from app.database import async_session_maker
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def cell_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    # Excel has no time zones, so timestamps are written as naive UTC
+    if isinstance(value, datetime.datetime) and value.tzinfo:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def stream_rows(stmt):
+    # The request session is closed once the endpoint returns, so the stream keeps its own one open
+    async with async_session_maker() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_CHUNK))
+        yield list(result.keys())
+        async for partition in result.partitions():
+            yield [[cell_value(value) for value in row] for row in partition]
+
+
+async def csv_chunks(stmt):
+    # The BOM makes Excel open the file as UTF-8
+    yield b'\xef\xbb\xbf'
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = True
+    async for rows in stream_rows(stmt):
+        writer.writerows([rows] if header else rows)
+        header = False
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def append_rows(sheet, rows: list[list]):
+    for row in rows:
+        sheet.append(row)
+
+
+async def xlsx_chunks(stmt, title: str):
+    # A write-only workbook spills appended rows to a temp file, so memory stays flat however many rows there are.
+    # openpyxl is synchronous, so every call into it runs in a worker thread
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    header = True
+    async for rows in stream_rows(stmt):
+        await asyncio.to_thread(append_rows, sheet, [rows] if header else rows)
+        header = False
+
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+        while chunk := await asyncio.to_thread(file.read, 1024 * 1024):
+            yield chunk
+
+
+def export_objects(table: str, export_format: str, filters: dict, fields: Optional[list[str]] = None):
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid export format")
+
+    stmt, table_obj, columns = filter_statement(table=table, fields=fields, **filters)
+    if not columns and table != 'all':
+        stmt = stmt.with_only_columns(*inspect(table_obj).columns)
+
+    chunks = csv_chunks(stmt) if export_format == 'csv' else xlsx_chunks(stmt, table)
+    filename = f"{table}_{datetime.date.today().isoformat()}.{export_format}"
+    return StreamingResponse(chunks, media_type=EXPORT_FORMATS[export_format],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
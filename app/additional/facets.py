@@ -0,0 +1,52 @@
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import FACET_PRICE_BUCKETS
+
+FACETS = ('district', 'rooms', 'house_condition', 'current_status', 'price')
+
+
+def price_bucket(table_obj):
+    # Bounds are rendered inline so the expression in SELECT and GROUPING SETS is the same one for Postgres
+    return case(*[(table_obj.price >= literal_column(str(bound)), literal_column(str(bound)))
+                  for bound in reversed(FACET_PRICE_BUCKETS)])
+
+
+def facet_columns(table_obj, facets: list[str]) -> dict:
+    unknown = set(facets) - set(FACETS)
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid facet: {', '.join(sorted(unknown))}")
+    return {facet: price_bucket(table_obj) if facet == 'price' else getattr(table_obj, facet)
+            for facet in FACETS if facet in facets}
+
+
+def facet_value(facet: str, value):
+    if facet != 'price':
+        return {"value": value}
+    if value is None:
+        return {"min": None, "max": None}
+    upper = [bound for bound in FACET_PRICE_BUCKETS if bound > value]
+    return {"min": value, "max": upper[0] if upper else None}
+
+
+async def facet_counts(db: AsyncSession, stmt, table_obj, facets: list[str]) -> dict:
+    columns = facet_columns(table_obj, facets)
+    groupings = [func.grouping(column) for column in columns.values()]
+    facet_stmt = stmt.with_only_columns(*columns.values(), *groupings, func.count(), maintain_column_froms=True) \
+        .order_by(None).group_by(func.grouping_sets(*columns.values()))
+
+    result = {facet: [] for facet in columns}
+    size = len(columns)
+    for row in (await db.execute(facet_stmt)).all():
+        # Every row belongs to a single grouping set, the one whose GROUPING() is 0
+        index = row[size:2 * size].index(0)
+        facet = list(columns)[index]
+        result[facet].append({**facet_value(facet, row[index]), "count": row[-1]})
+
+    for facet, counts in result.items():
+        if facet == 'price':
+            counts.sort(key=lambda item: (item["min"] is None, item["min"]))
+        else:
+            counts.sort(key=lambda item: item["count"], reverse=True)
+    return result
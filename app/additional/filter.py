@@ -1,26 +1,59 @@
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, inspect, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 
+from app.additional.count_cache import cached_count
+from app.additional.facets import facet_counts
+from app.additional.listing import listing
 from app.object.models.apartment import Apartment
 from app.object.models.commercial import Commercial
 from app.object.models.land import Land
 from app.object.models import ActionType, HouseType, BathroomType, CurrentStatus, HouseCondition, LocationCommercial, \
     LocationLand
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.projection import projection
 
 
-async def filter_objects(
-        db: AsyncSession,
+def cursor_clause(table_obj, table: str, cursor: str):
+    if table == 'all':
+        created_at, crm_id = decode_cursor(cursor, "created_at", "crm_id")
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        return tuple_(table_obj.created_at, table_obj.crm_id) < tuple_(created_at, crm_id)
+
+    last_id, = decode_cursor(cursor, "id")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return table_obj.id < last_id
+
+
+def in_values(column, values: list):
+    # A single value stays an equality, so plans for the common one-value filter don't change
+    values = list(dict.fromkeys(values))
+    return column == values[0] if len(values) == 1 else column.in_(values)
+
+
+def next_page_cursor(table: str, last_object):
+    if table == 'all':
+        return encode_cursor(created_at=last_object["created_at"].isoformat(), crm_id=last_object["crm_id"])
+    return encode_cursor(id=last_object["id"] if isinstance(last_object, Mapping) else last_object.id)
+
+
+def filter_statement(
         table: Optional[str] = None,
-        action_type: Optional[ActionType] = None,
-        district: Optional[str] = None,
-        metro_st: Optional[str] = None,
+        action_type: Optional[list[ActionType]] = None,
+        district: Optional[list[str]] = None,
+        metro_st: Optional[list[str]] = None,
         furniture: Optional[bool] = None,
-        bathroom: Optional[BathroomType] = None,
+        bathroom: Optional[list[BathroomType]] = None,
         price_min: Optional[int] = None,
         price_max: Optional[int] = None,
         room_min: Optional[int] = None,
@@ -31,28 +64,40 @@ async def filter_objects(
         floor_max: Optional[int] = None,
         date_min: Optional[str] = None,
         date_max: Optional[str] = None,
-        current_status: Optional[CurrentStatus] = None,
+        current_status: Optional[list[CurrentStatus]] = None,
         status_date_min: Optional[str] = None,
         status_date_max: Optional[str] = None,
-        house_type: Optional[HouseType] = None,
-        house_condition: Optional[HouseCondition] = None,
-        location_commercial: Optional[LocationCommercial] = None,
-        location_land: Optional[LocationLand] = None,
+        house_type: Optional[list[HouseType]] = None,
+        house_condition: Optional[list[HouseCondition]] = None,
+        location_commercial: Optional[list[LocationCommercial]] = None,
+        location_land: Optional[list[LocationLand]] = None,
         parking_place: Optional[bool] = None,
-        responsible: Optional[str] = None,
-        limit: Optional[int] = None,
-        page: Optional[int] = None
+        responsible: Optional[list[str]] = None,
+        updated_after: Optional[datetime] = None,
+        fields: Optional[list[str]] = None
 ):
     table_mapping = {
         "land": Land,
         "apartment": Apartment,
-        "commercial": Commercial
+        "commercial": Commercial,
+        "all": listing.c
     }
 
     table_obj = table_mapping.get(table)
-    if not table_obj:
+    if table_obj is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid table name")
 
+    if table == 'all':
+        # The listing union only has the columns shared by all three tables
+        unsupported = [name for name, value in (
+            ("metro_st", metro_st), ("bathroom", bathroom), ("floor_min", floor_min), ("floor_max", floor_max),
+            ("house_type", house_type), ("location_commercial", location_commercial),
+            ("location_land", location_land), ("parking_place", parking_place),
+        ) if value is not None and value is not False and value != []]
+        if unsupported:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Filters not supported for table=all: {', '.join(unsupported)}")
+
     try:
         if date_min:
             date_min = datetime.strptime(date_min, '%Y-%m-%d')
@@ -62,23 +107,28 @@ async def filter_objects(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format. Expected; YYYY-MM-DD")
 
 
-    stmt = select(table_obj)
+    columns = projection(table_obj if table == 'all' else inspect(table_obj).columns, fields)
+    if columns:
+        stmt = select(*columns)
+    else:
+        stmt = select(*listing.c) if table == 'all' else select(table_obj)
 
     if action_type:
-        stmt = stmt.filter_by(action_type=action_type)
+        stmt = stmt.where(in_values(table_obj.action_type, action_type))
 
     if district:
-        stmt = stmt.filter_by(district=district)
+        stmt = stmt.where(in_values(table_obj.district, district))
 
     if metro_st:
         if table == 'apartment':
-            stmt = stmt.filter_by(metro_st=metro_st)
+            stmt = stmt.where(in_values(table_obj.metro_st, metro_st))
 
     if furniture:
         stmt = stmt.filter_by(furnished=furniture)
 
     if bathroom:
-        stmt = stmt.filter_by(bathroom=bathroom)
+        if table == 'apartment':
+            stmt = stmt.where(in_values(table_obj.bathroom, bathroom))
 
     if price_min is not None and price_max is not None:
         stmt = stmt.where(and_(table_obj.price >= price_min, table_obj.price <= price_max))
@@ -117,22 +167,22 @@ async def filter_objects(
         stmt = stmt.where(and_(table_obj.created_at <= date_max))
 
     if current_status:
-        stmt = stmt.filter_by(current_status=current_status)
+        stmt = stmt.where(in_values(table_obj.current_status, current_status))
 
     if house_type:
         if table == 'apartment':
-            stmt = stmt.filter_by(house_type=house_type)
+            stmt = stmt.where(in_values(table_obj.house_type, house_type))
 
     if house_condition:
-        stmt = stmt.filter_by(house_condition=house_condition)
+        stmt = stmt.where(in_values(table_obj.house_condition, house_condition))
 
     if location_commercial:
         if table == 'commercial':
-            stmt = stmt.filter_by(location=location_commercial)
+            stmt = stmt.where(in_values(table_obj.location, location_commercial))
 
     if location_land:
         if table == 'land':
-            stmt = stmt.filter_by(location=location_land)
+            stmt = stmt.where(in_values(table_obj.location, location_land))
 
     if status_date_min is not None and status_date_max is not None:
         stmt = stmt.where(and_(table_obj.status_date >= status_date_min, table_obj.status_date <= status_date_max))
@@ -146,20 +196,83 @@ async def filter_objects(
             stmt = stmt.filter_by(parking_place=parking_place)
 
     if responsible:
-        stmt = stmt.where(and_(table_obj.responsible == responsible))
+        stmt = stmt.where(in_values(table_obj.responsible, responsible))
+
+    if updated_after:
+        stmt = stmt.where(table_obj.updated_at > updated_after)
 
-    stmt = stmt.order_by(table_obj.id.desc())
+    if table == 'all':
+        stmt = stmt.order_by(table_obj.created_at.desc(), table_obj.crm_id.desc())
+    else:
+        stmt = stmt.order_by(table_obj.id.desc())
 
-    count_stmt = stmt.with_only_columns(func.count()).order_by(None)
-    filtered_count = await db.scalar(count_stmt)
+    return stmt, table_obj, columns
 
-    if limit and page:
-        stmt = stmt.limit(limit).offset((page - 1) * limit)
+
+async def filter_objects(
+        db: AsyncSession,
+        table: Optional[str] = None,
+        action_type: Optional[list[ActionType]] = None,
+        district: Optional[list[str]] = None,
+        metro_st: Optional[list[str]] = None,
+        furniture: Optional[bool] = None,
+        bathroom: Optional[list[BathroomType]] = None,
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+        room_min: Optional[int] = None,
+        room_max: Optional[int] = None,
+        area_min: Optional[int] = None,
+        area_max: Optional[int] = None,
+        floor_min: Optional[int] = None,
+        floor_max: Optional[int] = None,
+        date_min: Optional[str] = None,
+        date_max: Optional[str] = None,
+        current_status: Optional[list[CurrentStatus]] = None,
+        status_date_min: Optional[str] = None,
+        status_date_max: Optional[str] = None,
+        house_type: Optional[list[HouseType]] = None,
+        house_condition: Optional[list[HouseCondition]] = None,
+        location_commercial: Optional[list[LocationCommercial]] = None,
+        location_land: Optional[list[LocationLand]] = None,
+        parking_place: Optional[bool] = None,
+        responsible: Optional[list[str]] = None,
+        updated_after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        page: Optional[int] = None,
+        cursor: Optional[str] = None,
+        facets: Optional[list[str]] = None,
+        fields: Optional[list[str]] = None
+):
+    filters = {name: value for name, value in locals().items() if name not in ('db', 'limit', 'page', 'cursor', 'facets')}
+    # Multi-value filters are keyed as sorted tuples, so the same set of values in any order shares a cached count
+    count_filters = tuple((name, tuple(sorted(set(value), key=str)) if isinstance(value, list) else value)
+                          for name, value in filters.items() if name != 'fields' and value is not None)
+    stmt, table_obj, columns = filter_statement(**filters)
+
+    count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    filtered_count = await cached_count(db, table, count_filters, count_stmt)
+    facet_result = await facet_counts(db, stmt, table_obj, facets) if facets else None
+
+    if cursor:
+        stmt = stmt.where(cursor_clause(table_obj, table, cursor))
+    elif limit and page:
+        stmt = stmt.offset((page - 1) * limit)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    if table != 'all' and not columns:
+        stmt = stmt.options(selectinload(table_obj.media))
 
     result = await db.execute(stmt)
-    objects = result.scalars().all()
+    objects = result.mappings().all() if table == 'all' or columns else result.scalars().all()
+
+    next_cursor = None
+    if limit and len(objects) == limit:
+        next_cursor = next_page_cursor(table, objects[-1])
 
     return {
         "filtered_count": filtered_count,
-        "objects": objects
+        "objects": objects,
+        "next_cursor": next_cursor,
+        "facets": facet_result
     }
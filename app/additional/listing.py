@@ -0,0 +1,19 @@
+from sqlalchemy import union_all
+from sqlalchemy.future import select
+
+from app.object.models.apartment import Apartment
+from app.object.models.commercial import Commercial
+from app.object.models.land import Land
+
+
+def listing_select(model):
+    return select(
+        model.id, model.crm_id, model.category, model.title, model.district, model.price, model.square_area,
+        model.rooms, model.action_type, model.house_condition, model.furnished, model.current_status,
+        model.status_date, model.responsible, model.created_at, model.updated_at,
+    )
+
+
+# Shared columns of all three object tables. Postgres pushes the outer WHERE into every branch, so each one
+# is served by that table's own filter indexes and ORDER BY created_at becomes a merge of index scans.
+listing = union_all(*[listing_select(model) for model in (Apartment, Land, Commercial)]).subquery('listing')
@@ -1,63 +1,167 @@
 from operator import attrgetter
+from typing import Optional
+import asyncio
 import logging
+import re
+import time
 
+import orjson
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_
+from sqlalchemy import func, inspect, literal, or_, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 
+from app.additional.listing import listing_select
+from app.config import OBJECT_TOTALS_TTL, SEARCH_MAX_LIMIT, SEARCH_STREAM_CHUNK
+from app.database import async_session_maker
 from app.object.models import ActionType
 from app.object.models.apartment import Apartment
 from app.object.models.commercial import Commercial
 from app.object.models.land import Land
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.projection import projection
+from app.utils.serialization import encode_default
 
 logger = logging.getLogger(__name__)
 
 
-async def search(db: AsyncSession, text: str, table: str):
+CRM_ID_PATTERN = re.compile(r'^[ALC]\d+$', re.IGNORECASE)
+SEARCH_MODES = ('fts', 'fuzzy')
+
+
+def ranked_select(stmt, model, text: str, mode: str = 'fts'):
+    if CRM_ID_PATTERN.match(text):
+        rank = (-func.length(model.crm_id)).label('rank')
+        return stmt.add_columns(rank).where(model.crm_id.like(f'{text.upper()}%')), rank
+
+    if mode == 'fuzzy':
+        rank = func.greatest(func.word_similarity(text, model.title), func.similarity(text, model.crm_id)).label('rank')
+        return stmt.add_columns(rank).where(or_(model.title.op('%>')(text), model.crm_id.op('%')(text))), rank
+
+    search_vector = model.__table__.c.search_vector
+    query = func.websearch_to_tsquery('simple', text)
+    rank = func.ts_rank(search_vector, query).label('rank')
+    return stmt.add_columns(rank).where(search_vector.op('@@')(query)), rank
+
+
+def search_statement(text: str, table: str, mode: str, fields: Optional[list[str]] = None):
     table_mapping = {
         "land": Land,
         "apartment": Apartment,
-        "commercial": Commercial
+        "commercial": Commercial,
     }
-    table_obj = table_mapping.get(table)
-    if not table_obj:
+    if table != 'all' and table not in table_mapping:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid table name")
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid search mode")
+
+    if table == 'all':
+        matches = union_all(*[ranked_select(listing_select(model), model, text, mode)[0]
+                              for model in table_mapping.values()]).subquery('matches')
+        columns = projection(matches.c, fields)
+        stmt = select(*columns, matches.c.rank) if columns else select(*matches.c)
+        return stmt, (matches.c.rank, matches.c.crm_id)
+
+    table_obj = table_mapping[table]
+    columns = projection(inspect(table_obj).columns, fields)
+    stmt = select(*columns) if columns else select(table_obj).options(selectinload(table_obj.media))
+    stmt, rank = ranked_select(stmt, table_obj, text, mode)
+    return stmt, (rank, table_obj.id)
+
+
+async def set_similarity_threshold(db: AsyncSession, threshold: float):
+    await db.execute(select(func.set_config('pg_trgm.similarity_threshold', str(threshold), True),
+                            func.set_config('pg_trgm.word_similarity_threshold', str(threshold), True)))
+
+
+async def search(db: AsyncSession, text: str, table: str, limit: int = 20, page: int = 1,
+                 mode: str = 'fts', threshold: float = 0.3, cursor: Optional[str] = None,
+                 fields: Optional[list[str]] = None):
+    stmt, (rank, key) = search_statement(text, table, mode, fields)
+    limit = min(limit, SEARCH_MAX_LIMIT)
+
+    if cursor:
+        last_rank, last_key = decode_cursor(cursor, "rank", "key")
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_key, str if table == 'all' else int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(rank, key) < tuple_(last_rank, last_key))
+    else:
+        stmt = stmt.offset((page - 1) * limit)
+    stmt = stmt.order_by(rank.desc(), key.desc()).limit(limit)
 
-    matched_objects = []
     try:
-        res = select(table_obj).where(or_(
-            table_obj.title.ilike(f'%{text}%'),
-            table_obj.crm_id.ilike(f'%{text}%'),
-            )
-        )
-        db_res = await db.execute(res)
-        matched_objects.extend(db_res.scalars().all())
+        if mode == 'fuzzy':
+            await set_similarity_threshold(db, threshold)
+
+        db_res = await db.execute(stmt)
+        rows = db_res.all()
 
     except Exception as e:
         logger.error(f"Error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-    return matched_objects
+    if table == 'all':
+        matched_objects = [row._mapping for row in rows]
+        next_cursor = encode_cursor(rank=rows[-1].rank, key=rows[-1].crm_id) if len(rows) == limit else None
+    elif fields:
+        matched_objects = [row._mapping for row in rows]
+        next_cursor = encode_cursor(rank=rows[-1].rank, key=rows[-1].id) if len(rows) == limit else None
+    else:
+        matched_objects = [row[0] for row in rows]
+        next_cursor = encode_cursor(rank=rows[-1].rank, key=rows[-1][0].id) if len(rows) == limit else None
 
+    return {"data": matched_objects, "next_cursor": next_cursor}
 
-async def get_all_object(db: AsyncSession):
-    land_count_sale = await db.scalar(select(func.count(Land.id)).where(Land.action_type == ActionType.SALE))
-    apartment_count_sale = await db.scalar(select(func.count(Apartment.id)).where(Apartment.action_type == ActionType.SALE))
-    commercial_count_sale = await db.scalar(select(func.count(Commercial.id)).where(Commercial.action_type == ActionType.SALE))
-    land_count_rent = await db.scalar(select(func.count(Land.id)).where(Land.action_type == ActionType.RENT))
-    apartment_count_rent = await db.scalar(select(func.count(Apartment.id)).where(Apartment.action_type == ActionType.RENT))
-    commercial_count_rent = await db.scalar(select(func.count(Commercial.id)).where(Commercial.action_type == ActionType.RENT))
+
+def stream_search(text: str, table: str, mode: str = 'fts', threshold: float = 0.3,
+                  fields: Optional[list[str]] = None):
+    stmt, (rank, key) = search_statement(text, table, mode, fields)
+    stmt = stmt.order_by(rank.desc(), key.desc()).execution_options(yield_per=SEARCH_STREAM_CHUNK)
+
+    async def ndjson_lines():
+        # The request session is closed once the endpoint returns, so the stream keeps its own one open
+        async with async_session_maker() as db:
+            if mode == 'fuzzy':
+                await set_similarity_threshold(db, threshold)
+
+            result = await db.stream(stmt)
+            rows = result.mappings() if table == 'all' or fields else result.scalars()
+            async for partition in rows.partitions():
+                yield b''.join(orjson.dumps(row, default=encode_default) + b'\n' for row in partition)
+
+    return ndjson_lines()
+
+
+async def count_objects(db: AsyncSession):
+    counts = union_all(*[
+        select(literal(table).label('table'), model.action_type, func.count().label('count')).group_by(model.action_type)
+        for table, model in (("land", Land), ("apartment", Apartment), ("commercial", Commercial))
+    ])
+    totals = {f"{table}_{action_type.value}": 0
+              for action_type in (ActionType.RENT, ActionType.SALE) for table in ("land", "apartment", "commercial")}
+    for row in await db.execute(counts):
+        totals[f"{row.table}_{row.action_type.value}"] = row.count
 
     return {
-        "land": land_count_rent+land_count_sale,
-        "apartment": apartment_count_rent+apartment_count_sale,
-        "commercial": commercial_count_rent+commercial_count_sale,
-        "total": land_count_sale + apartment_count_sale + commercial_count_sale + land_count_rent + apartment_count_rent + commercial_count_rent,
-        "land_rent": land_count_rent,
-        "apartment_rent": apartment_count_rent,
-        "commercial_rent": commercial_count_rent,
-        "land_sale": land_count_sale,
-        "apartment_sale": apartment_count_sale,
-        "commercial_sale": commercial_count_sale,
+        "land": totals["land_rent"] + totals["land_sale"],
+        "apartment": totals["apartment_rent"] + totals["apartment_sale"],
+        "commercial": totals["commercial_rent"] + totals["commercial_sale"],
+        "total": sum(totals.values()),
+        **totals,
     }
+
+
+_object_totals: Optional[dict] = None
+_object_totals_at = 0.0
+_object_totals_lock = asyncio.Lock()
+
+
+async def get_all_object(db: AsyncSession):
+    global _object_totals, _object_totals_at
+
+    async with _object_totals_lock:
+        if _object_totals is None or time.monotonic() - _object_totals_at > OBJECT_TOTALS_TTL:
+            _object_totals = await count_objects(db)
+            _object_totals_at = time.monotonic()
+    return _object_totals
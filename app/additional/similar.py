@@ -0,0 +1,260 @@
+import asyncio
+import logging
+from typing import Optional, Type
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.config import DISTRICT_NEIGHBOURS, INDEX_RELOAD_INTERVAL, SIMILAR_DISTRICT_PENALTY
+from app.database import async_session_maker
+from app.object.models import ActionType
+from app.object.models.apartment import Apartment
+from app.object.models.commercial import Commercial
+from app.object.models.land import Land
+from app.utils.commit_changes import track_changes
+from app.utils.projection import projection
+
+logger = logging.getLogger(__name__)
+
+# Columns compared per table, in the order of the matrix columns: price, area, rooms, floor
+SIMILAR_FEATURES = {
+    "apartment": ("price", "square_area", "rooms", "floor"),
+    "land": ("price", "square_area", "rooms", "floor_number"),
+    "commercial": ("price", "square_area", "rooms", "floor_number"),
+}
+ACTION_CODES = {action_type: code for code, action_type in enumerate(ActionType)}
+
+
+def adjacent_districts(neighbours: dict[str, list[str]]) -> dict[str, set[str]]:
+    adjacent = {}
+    for district, others in neighbours.items():
+        for other in others:
+            adjacent.setdefault(district, set()).add(other)
+            adjacent.setdefault(other, set()).add(district)
+    return adjacent
+
+
+ADJACENT_DISTRICTS = adjacent_districts(DISTRICT_NEIGHBOURS)
+
+
+def feature_values(price, square_area, rooms, floor) -> list[float]:
+    # Price and area are compared on a log scale, so 10% apart is equally near for cheap and expensive objects
+    return [np.log1p(max(price or 0, 0)), np.log1p(max(square_area or 0, 0)), rooms or 0, floor or 0]
+
+
+class FeatureMatrix:
+    # Rows 0..size-1 are live. A removed row is replaced by the last one, so a query is one pass over a dense block
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.features = np.empty((0, 4))
+        self.action_types = np.empty(0, dtype=np.int8)
+        self.districts = np.empty(0, dtype=np.int32)
+        self.scale = np.ones(4)
+        self.rows: dict[int, int] = {}
+        self.size = 0
+
+    def fit(self, ids: list[int], features: list[list[float]], action_types: list[int], districts: list[int]):
+        raw = np.array(features, dtype=np.float64).reshape(-1, 4)
+        scale = raw.std(axis=0) if len(raw) else np.ones(4)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.features = raw / self.scale
+        self.ids = np.array(ids, dtype=np.int64)
+        self.action_types = np.array(action_types, dtype=np.int8)
+        self.districts = np.array(districts, dtype=np.int32)
+        self.rows = {object_id: row for row, object_id in enumerate(ids)}
+        self.size = len(ids)
+
+    def reserve(self):
+        if self.size < len(self.ids):
+            return
+        capacity = max(16, 2 * len(self.ids))
+        self.ids = np.resize(self.ids, capacity)
+        self.features = np.resize(self.features, (capacity, 4))
+        self.action_types = np.resize(self.action_types, capacity)
+        self.districts = np.resize(self.districts, capacity)
+
+    def set(self, object_id: int, features: list[float], action_type: int, district: int):
+        row = self.rows.get(object_id)
+        if row is None:
+            self.reserve()
+            row = self.rows[object_id] = self.size
+            self.size += 1
+        self.ids[row] = object_id
+        self.features[row] = np.asarray(features) / self.scale
+        self.action_types[row] = action_type
+        self.districts[row] = district
+
+    def remove(self, object_id: int):
+        row = self.rows.pop(object_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            self.ids[row] = self.ids[last]
+            self.features[row] = self.features[last]
+            self.action_types[row] = self.action_types[last]
+            self.districts[row] = self.districts[last]
+            self.rows[int(self.ids[row])] = row
+        self.size = last
+
+    def nearest(self, object_id: int, district_codes: list[int], limit: int) -> Optional[list[int]]:
+        row = self.rows.get(object_id)
+        if row is None:
+            return None
+
+        size = self.size
+        mask = (self.action_types[:size] == self.action_types[row]) & np.isin(self.districts[:size], district_codes)
+        mask[row] = False
+        candidates = np.flatnonzero(mask)
+        diff = self.features[candidates] - self.features[row]
+        distances = np.einsum('ij,ij->i', diff, diff)
+        distances += SIMILAR_DISTRICT_PENALTY * (self.districts[candidates] != self.districts[row])
+
+        if len(candidates) > limit:
+            top = np.argpartition(distances, limit)[:limit]
+            candidates, distances = candidates[top], distances[top]
+        return self.ids[candidates[np.argsort(distances, kind='stable')]].tolist()
+
+
+class SimilarIndex:
+    def __init__(self):
+        self.matrices = {table: FeatureMatrix() for table in SIMILAR_FEATURES}
+        self.district_codes: dict[str, int] = {}
+        self.district_names: list[str] = []
+        self.loaded = False
+
+    def district_code(self, district: str) -> int:
+        code = self.district_codes.get(district)
+        if code is None:
+            code = self.district_codes[district] = len(self.district_names)
+            self.district_names.append(district)
+        return code
+
+    @classmethod
+    def build(cls, table_rows: dict[str, list]) -> 'SimilarIndex':
+        index = cls()
+        for table, rows in table_rows.items():
+            index.fit(table, rows)
+        index.loaded = True
+        return index
+
+    def fit(self, table: str, rows):
+        ids, features, action_types, districts = [], [], [], []
+        for row in rows:
+            ids.append(row.id)
+            features.append(feature_values(*row[3:]))
+            action_types.append(ACTION_CODES[row.action_type])
+            districts.append(self.district_code(row.district))
+        self.matrices[table].fit(ids, features, action_types, districts)
+
+    def set(self, table: str, document: dict):
+        self.matrices[table].set(document["id"], feature_values(*document["features"]),
+                                 ACTION_CODES[document["action_type"]], self.district_code(document["district"]))
+
+    def remove(self, table: str, object_id: int):
+        self.matrices[table].remove(object_id)
+
+    def nearest(self, table: str, object_id: int, limit: int) -> Optional[list[int]]:
+        matrix = self.matrices[table]
+        row = matrix.rows.get(object_id)
+        if row is None:
+            return None
+        district = self.district_names[matrix.districts[row]]
+        codes = [self.district_codes[name] for name in (district, *ADJACENT_DISTRICTS.get(district, ()))
+                 if name in self.district_codes]
+        return matrix.nearest(object_id, codes, limit)
+
+
+similar_index = SimilarIndex()
+# Changes committed while a reload runs. The new index may have read the rows before them, so they are replayed on it
+_reloading: Optional[list] = None
+
+table_mapping = {
+    "land": Land,
+    "apartment": Apartment,
+    "commercial": Commercial,
+}
+
+
+def object_document(target) -> dict:
+    return {"id": target.id, "action_type": target.action_type, "district": target.district,
+            "features": [getattr(target, name) for name in SIMILAR_FEATURES[target.__tablename__]]}
+
+
+def apply_changes(index: SimilarIndex, changes: list):
+    for table, object_id, document in changes:
+        if document is None:
+            index.remove(table, object_id)
+        else:
+            index.set(table, document)
+
+
+async def load_similar_index():
+    global similar_index, _reloading
+
+    _reloading = []
+    try:
+        table_rows = {}
+        async with async_session_maker() as session:
+            for table, model in table_mapping.items():
+                columns = [getattr(model, name) for name in SIMILAR_FEATURES[table]]
+                result = await session.execute(select(model.id, model.action_type, model.district, *columns))
+                table_rows[table] = result.all()
+
+        # Fitted in a worker thread so the event loop keeps serving requests; the changes committed meanwhile
+        # are replayed back on the loop, where _reloading is filled
+        index = await asyncio.to_thread(SimilarIndex.build, table_rows)
+        apply_changes(index, _reloading)
+        similar_index = index
+    finally:
+        _reloading = None
+
+
+async def reload_similar_index_periodically():
+    # Commits in this process are applied at once; the reload picks up those made by other worker processes
+    # and refits the feature scale
+    while True:
+        await asyncio.sleep(INDEX_RELOAD_INTERVAL)
+        try:
+            await load_similar_index()
+        except Exception as e:
+            logger.error(f"Failed to reload similar index: {e}")
+
+
+async def similar_objects(db: AsyncSession, table: str, object_id: int, limit: int = 10,
+                          fields: Optional[list[str]] = None):
+    if not similar_index.loaded:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Индекс похожих объектов еще не готов")
+
+    ids = similar_index.nearest(table, object_id, limit)
+    if ids is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект не найден")
+    if not ids:
+        return {"data": []}
+
+    model = table_mapping[table]
+    columns = projection(inspect(model).columns, fields)
+    stmt = select(*columns) if columns else select(model).options(selectinload(model.media))
+    result = await db.execute(stmt.where(model.id.in_(ids)))
+    objects = {obj["id"] if columns else obj.id: obj
+               for obj in (result.mappings().all() if columns else result.scalars().all())}
+
+    return {"data": [objects[object_id] for object_id in ids if object_id in objects]}
+
+
+def object_change(target, deleted: bool):
+    return target.__tablename__, target.id, None if deleted else object_document(target)
+
+
+def apply_committed(changes: list):
+    apply_changes(similar_index, changes)
+    if _reloading is not None:
+        _reloading.extend(changes)
+
+
+def register_similar_listener(model: Type):
+    track_changes(model, 'similar_changes', object_change, apply_committed)
@@ -0,0 +1,199 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+from itertools import count, islice
+from typing import Optional, Type
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.additional.listing import listing
+from app.config import INDEX_RELOAD_INTERVAL
+from app.database import async_session_maker
+from app.object.models import Category
+from app.utils.commit_changes import track_changes
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: Optional[str]) -> set[str]:
+    return set(TOKEN_PATTERN.findall(text.lower())) if text else set()
+
+
+def object_document(target) -> dict:
+    return {"id": target.id, "crm_id": target.crm_id, "title": target.title, "district": target.district}
+
+
+class SuggestIndex:
+    # Postings are ordered from the least to the most recently indexed document. Prefixes up to SHORT_PREFIX
+    # characters match too many tokens to be merged per request, so their postings are kept precomputed.
+    SHORT_PREFIX = 3
+
+    def __init__(self):
+        self.documents: dict[tuple[str, int], dict] = {}
+        self.positions: dict[tuple[str, int], int] = {}
+        self.postings: dict[str, dict[tuple[str, int], None]] = {}
+        self.prefix_postings: dict[str, dict[tuple[str, int], None]] = {}
+        self.tokens: list[str] = []
+        self.counter = count()
+        self.loaded = False
+
+    @staticmethod
+    def document_tokens(document: dict) -> set[str]:
+        return tokenize(f"{document['crm_id']} {document['title']} {document['district']}")
+
+    @classmethod
+    def short_prefixes(cls, tokens: set[str]) -> set[str]:
+        return {token[:length] for token in tokens for length in range(1, min(len(token), cls.SHORT_PREFIX) + 1)}
+
+    @classmethod
+    def build(cls, documents) -> 'SuggestIndex':
+        # Tokens are sorted once at the end rather than inserted one by one
+        index = cls()
+        for table, document in documents:
+            index.index_document(table, document)
+        index.tokens = sorted(index.postings)
+        index.loaded = True
+        return index
+
+    def add(self, table: str, document: dict):
+        for token in self.index_document(table, document):
+            bisect.insort(self.tokens, token)
+
+    def index_document(self, table: str, document: dict) -> list[str]:
+        # Returns the tokens not indexed before, the caller keeps self.tokens in order
+        self.remove(table, document["id"])
+        key = (table, document["id"])
+        tokens = self.document_tokens(document)
+        self.documents[key] = document
+        self.positions[key] = next(self.counter)
+        new_tokens = []
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                new_tokens.append(token)
+            posting[key] = None
+        for prefix in self.short_prefixes(tokens):
+            self.prefix_postings.setdefault(prefix, {})[key] = None
+        return new_tokens
+
+    def remove(self, table: str, object_id: int):
+        key = (table, object_id)
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        del self.positions[key]
+        tokens = self.document_tokens(document)
+        for token in tokens:
+            posting = self.postings[token]
+            del posting[key]
+            if not posting:
+                del self.postings[token]
+                del self.tokens[bisect.bisect_left(self.tokens, token)]
+        for prefix in self.short_prefixes(tokens):
+            posting = self.prefix_postings[prefix]
+            del posting[key]
+            if not posting:
+                del self.prefix_postings[prefix]
+
+    def prefix_matches(self, prefix: str):
+        if len(prefix) <= self.SHORT_PREFIX:
+            return self.prefix_postings.get(prefix, {})
+        low = bisect.bisect_left(self.tokens, prefix)
+        high = bisect.bisect_left(self.tokens, prefix + chr(0x10FFFF))
+        if high - low == 1:
+            return self.postings[self.tokens[low]]
+        return set().union(*[self.postings[token] for token in self.tokens[low:high]])
+
+    def search(self, text: str, table: Optional[str] = None, limit: int = 10) -> list[dict]:
+        matches = sorted((self.prefix_matches(token) for token in tokenize(text)), key=len)
+        if not matches or not matches[0]:
+            return []
+
+        candidates, others = matches[0], matches[1:]
+        if isinstance(candidates, dict):
+            # Newest first, so only as many keys are checked as it takes to fill the page
+            candidates = reversed(candidates)
+        keys = (key for key in candidates
+                if (not table or key[0] == table) and all(key in other for other in others))
+        if isinstance(matches[0], dict):
+            keys = islice(keys, limit)
+        else:
+            keys = heapq.nlargest(limit, keys, key=self.positions.__getitem__)
+        return [{"table": key[0], **self.documents[key]} for key in keys]
+
+
+suggest_index = SuggestIndex()
+# Changes committed while a reload runs. The new index may have read the rows before them, so they are replayed on it
+_reloading: Optional[list] = None
+
+
+def apply_changes(index: SuggestIndex, changes: list):
+    for table, object_id, document in changes:
+        if document is None:
+            index.remove(table, object_id)
+        else:
+            index.add(table, document)
+
+
+async def load_suggest_index():
+    global suggest_index, _reloading
+
+    _reloading = []
+    try:
+        async with async_session_maker() as session:
+            result = await session.execute(select(listing.c.category, listing.c.id, listing.c.crm_id, listing.c.title,
+                                                  listing.c.district).order_by(listing.c.created_at))
+            rows = result.all()
+
+        # Built in a worker thread so the event loop keeps serving requests; the changes committed meanwhile
+        # are replayed back on the loop, where _reloading is filled
+        index = await asyncio.to_thread(SuggestIndex.build, (
+            (row.category.value, {"id": row.id, "crm_id": row.crm_id, "title": row.title, "district": row.district})
+            for row in rows))
+        apply_changes(index, _reloading)
+        suggest_index = index
+    finally:
+        _reloading = None
+
+
+async def reload_suggest_index_periodically():
+    # Commits in this process are applied at once; the reload picks up those made by other worker processes
+    while True:
+        await asyncio.sleep(INDEX_RELOAD_INTERVAL)
+        try:
+            await load_suggest_index()
+        except Exception as e:
+            logger.error(f"Failed to reload suggest index: {e}")
+
+
+async def suggest(db: AsyncSession, text: str, table: Optional[str] = None, limit: int = 10):
+    if suggest_index.loaded:
+        return suggest_index.search(text, table, limit)
+
+    stmt = select(listing.c.category.label('table'), listing.c.id, listing.c.crm_id, listing.c.title,
+                  listing.c.district).where(or_(listing.c.crm_id.ilike(f'{text}%'), listing.c.title.ilike(f'%{text}%')))
+    if table:
+        stmt = stmt.where(listing.c.category == Category(table))
+    result = await db.execute(stmt.order_by(listing.c.created_at.desc()).limit(limit))
+    return [{**row, "table": row["table"].value} for row in result.mappings()]
+
+
+def object_change(target, deleted: bool):
+    return target.__tablename__, target.id, None if deleted else object_document(target)
+
+
+def apply_committed(changes: list):
+    apply_changes(suggest_index, changes)
+    if _reloading is not None:
+        _reloading.extend(changes)
+
+
+def register_suggest_listener(model: Type):
+    track_changes(model, 'suggest_changes', object_change, apply_committed)
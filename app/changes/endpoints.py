@@ -5,6 +5,7 @@ from app.changes.funcs import get_changes_log
 from app.database import get_async_session
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter()
 
@@ -16,4 +17,4 @@ async def get_changes_log_endpoint(
         limit: int = 10,
         page: int = 1,
 ):
-    return await get_changes_log(db, limit, page)
+    return ORJSONResponse(await get_changes_log(db, limit, page))
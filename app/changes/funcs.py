@@ -4,7 +4,7 @@ from typing import Type
 from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.event import listens_for
@@ -58,7 +58,8 @@ def register_event_listener(model: Type):
         for instance in session.dirty:
             if isinstance(instance, model):
                 original_values = {}
-                for column in instance.__table__.columns:
+                # Mapped columns only: the table also has columns the mapper leaves out, such as search_vector
+                for column in inspect(instance).mapper.column_attrs:
                     try:
                         history = get_history(instance, column.key)
                         if history.has_changes():
@@ -1,5 +1,9 @@
 
+from app.additional.count_cache import register_count_cache_listener
+from app.additional.similar import register_similar_listener
+from app.additional.suggest import register_suggest_listener
 from app.changes.funcs import register_event_listener
+from app.config import SUGGEST_INDEX
 
 from app.object.models.land import Land
 from app.object.models.apartment import Apartment
@@ -9,3 +13,7 @@ from app.object.models.commercial import Commercial
 def register_event_listeners():
     for model in [Land, Apartment, Commercial]:
         register_event_listener(model)
+        register_count_cache_listener(model)
+        register_similar_listener(model)
+        if SUGGEST_INDEX:
+            register_suggest_listener(model)
@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+import json
 import os
 
 load_dotenv()
@@ -15,6 +16,25 @@ ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
 MAX_VIDEO_SIZE = 30 * 1024 * 1024  # 30 MB
+MEDIA_CHUNK = 1024 * 1024  # bytes copied per read when saving uploads
+
+SEARCH_MAX_LIMIT = 100
+SEARCH_STREAM_CHUNK = 500
+SUGGEST_INDEX = os.getenv("SUGGEST_INDEX", "true").lower() == "true"
+INDEX_RELOAD_INTERVAL = int(os.getenv("INDEX_RELOAD_INTERVAL", 300))  # seconds, in-memory indexes rebuilt from the database
+FACET_PRICE_BUCKETS = [0, 10000, 25000, 50000, 75000, 100000, 250000]
+OBJECT_TOTALS_TTL = 10  # seconds
+COUNT_CACHE_TTL = 30  # seconds
+ANALYTICS_REFRESH_INTERVAL = int(os.getenv("ANALYTICS_REFRESH_INTERVAL", 300))  # seconds
+# {"district": ["adjacent district", ...]}, adjacency is symmetric
+DISTRICT_NEIGHBOURS = json.loads(os.getenv("DISTRICT_NEIGHBOURS", "{}"))
+SIMILAR_DISTRICT_PENALTY = 1.0  # squared normalized distance added for an adjacent district
+MATCHING_INTERVAL = int(os.getenv("MATCHING_INTERVAL", 60))  # seconds
+MATCHING_OVERLAP = 10  # seconds, re-checked so rows committed late by slow transactions are not missed
+SAVED_SEARCH_OVERLAP = 10  # seconds, same as MATCHING_OVERLAP for saved search runs
+IMPORT_MAX_ROWS = 5000
+EXPORT_CHUNK = 1000  # rows fetched per round trip of the export cursor
+REFERENCE_DATA_TTL = 300  # seconds
 
 # Telegram
 TOKEN = os.getenv("TOKEN")
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 
 from app.district.model import District
 from app.district.schema import DistrictCreate, DistrictUpdate
+from app.utils.reference_data import invalidate_reference_data
 
 
 async def create_district(db: AsyncSession, district: DistrictCreate):
@@ -12,6 +13,7 @@ async def create_district(db: AsyncSession, district: DistrictCreate):
         db_district = District(**district.model_dump())
         db.add(db_district)
         await db.commit()
+        invalidate_reference_data()
         await db.refresh(db_district)
 
         return db_district
@@ -54,6 +56,7 @@ async def update_district(db: AsyncSession, district_id: int, district: District
             setattr(db_district, key, value)
 
         await db.commit()
+        invalidate_reference_data()
 
         return db_district
     except Exception as e:
@@ -65,4 +68,5 @@ async def delete_district(db: AsyncSession, district_id: int):
     db_district = await get_district(db, district_id)
     await db.delete(db_district)
     await db.commit()
+    invalidate_reference_data()
     return HTTPException(status_code=status.HTTP_200_OK, detail="Район удален")
@@ -5,10 +5,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app.additional.similar import load_similar_index, reload_similar_index_periodically
+from app.additional.suggest import load_suggest_index, reload_suggest_index_periodically
 from app.auth.superuser import create_superuser
 from app.changes.funcs import process_log_queue
 from app.changes.track_models import register_event_listeners
+from app.config import SUGGEST_INDEX
 from app.database import create_db_and_tables
+from app.report.analytics.funcs import refresh_snapshot_periodically
+from app.report.matching.funcs import refresh_matches_periodically
+from app.utils.reference_data import load_reference_data
 from app import router
 
 from app.bot.run_bot import run_bot
@@ -20,7 +26,16 @@ async def lifespan(main_app: FastAPI):
     await create_superuser()
 
     register_event_listeners()
+    await load_reference_data()
+    suggest_task = None
+    if SUGGEST_INDEX:
+        await load_suggest_index()
+        suggest_task = asyncio.create_task(reload_suggest_index_periodically())
+    await load_similar_index()
+    similar_task = asyncio.create_task(reload_similar_index_periodically())
     log_queue_task = asyncio.create_task(process_log_queue())
+    analytics_task = asyncio.create_task(refresh_snapshot_periodically())
+    matching_task = asyncio.create_task(refresh_matches_periodically())
 
     bot_task = asyncio.create_task(run_bot())
 
@@ -29,9 +44,19 @@ async def lifespan(main_app: FastAPI):
     finally:
         bot_task.cancel()
         log_queue_task.cancel()
+        analytics_task.cancel()
+        matching_task.cancel()
+        similar_task.cancel()
+        if suggest_task:
+            suggest_task.cancel()
         try:
             await log_queue_task
             await bot_task
+            await analytics_task
+            await matching_task
+            await similar_task
+            if suggest_task:
+                await suggest_task
         except asyncio.CancelledError:
             pass
 
@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 
 from app.metro.model import Metro
 from app.metro.schema import MetroCreate, MetroUpdate
+from app.utils.reference_data import invalidate_reference_data
 
 
 async def create_metro(db: AsyncSession, metro: MetroCreate):
@@ -12,6 +13,7 @@ async def create_metro(db: AsyncSession, metro: MetroCreate):
         db_metro = Metro(**metro.model_dump())
         db.add(db_metro)
         await db.commit()
+        invalidate_reference_data()
         await db.refresh(db_metro)
 
         return db_metro
@@ -55,6 +57,7 @@ async def update_metro(db: AsyncSession, metro_id: int, metro: MetroUpdate):
             setattr(db_metro, key, value)
 
         await db.commit()
+        invalidate_reference_data()
 
         return db_metro
     except Exception as e:
@@ -66,4 +69,5 @@ async def delete_metro(db: AsyncSession, metro_id: int):
     db_metro = await get_metro(db, metro_id)
     await db.delete(db_metro)
     await db.commit()
+    invalidate_reference_data()
     return HTTPException(status_code=status.HTTP_204_NO_CONTENT, detail="Метро успешно удалено")
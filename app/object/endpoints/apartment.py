@@ -3,11 +3,15 @@ from typing import List, Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.additional.similar import similar_objects
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
 from app.database import get_async_session
+from app.object.models import Category
 from app.object.functions.apartment import create_apartment, get_apartments, get_apartment, update_apartment, delete_apartment
 from app.object.schemas.apartment import ApartmentUpdate, ApartmentCreate, ApartmentResponse
+from app.report.matching.funcs import get_interested_clients
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter()
 
@@ -18,9 +22,9 @@ async def create_apartment_endpoint(current_user: Annotated[UserRead, Depends(ge
                                     background_tasks: BackgroundTasks,
                                     apartment: ApartmentCreate = Query(...),
                                     media: Optional[List[UploadFile]] = File(None),):
-    return await create_apartment(
+    return ORJSONResponse(await create_apartment(
         db=db, apartment=apartment, media=media if media else None, current_user=current_user,
-        background_tasks=background_tasks)
+        background_tasks=background_tasks))
 
 
 @router.get("/")
@@ -29,8 +33,10 @@ async def get_apartment_endpoint(
         db: Annotated[AsyncSession, Depends(get_async_session)],
         limit: int = Query(10, ge=1),
         page: int = Query(1, ge=1),
+        fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                  examples=[["card"], ["title", "price", "district"]]),
 ):
-    return await get_apartments(db, limit, page)
+    return ORJSONResponse(await get_apartments(db, limit, page, fields))
 
 
 @router.get("/{apartment_id}", response_model=ApartmentResponse)
@@ -40,17 +46,36 @@ async def get_apartment_endpoint(current_user: Annotated[UserRead, Depends(get_c
     return await get_apartment(db, apartment_id)
 
 
+@router.get("/{apartment_id}/similar")
+async def get_similar_apartments_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                          db: Annotated[AsyncSession, Depends(get_async_session)],
+                                          apartment_id: int,
+                                          limit: int = Query(10, ge=1, le=50),
+                                          fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                                                    examples=[["card"], ["title", "price", "district"]])):
+    return ORJSONResponse(await similar_objects(db, 'apartment', apartment_id, limit, fields))
+
+
+@router.get("/{apartment_id}/interested-clients")
+async def get_interested_clients_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                          db: Annotated[AsyncSession, Depends(get_async_session)],
+                                          apartment_id: int,
+                                          limit: int = Query(10, ge=1),
+                                          page: int = Query(1, ge=1)):
+    return ORJSONResponse(await get_interested_clients(db, Category.APARTMENT, apartment_id, limit, page))
+
+
 @router.put("/{apartment_id}")
 async def update_apartment_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
                                     db: Annotated[AsyncSession, Depends(get_async_session)],
                                     background_tasks: BackgroundTasks,
                                     apartment_id: int, apartment: ApartmentUpdate = Query(...),
                                     media: Optional[List[UploadFile]] = File(None)):
-    return await update_apartment(
+    return ORJSONResponse(await update_apartment(
         db=db, apartment_id=apartment_id,
         apartment=apartment, user=current_user,
         media=media if media else None,
-        background_tasks=background_tasks)
+        background_tasks=background_tasks))
 
 
 @router.delete("/{apartment_id}")
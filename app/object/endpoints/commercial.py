@@ -3,13 +3,17 @@ from typing import List, Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.additional.similar import similar_objects
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
 from app.database import get_async_session
 
+from app.object.models import Category
 from app.object.functions.commercial import (create_commercial, get_commercials, get_commercial, update_commercial,
                                              delete_commercial)
 from app.object.schemas.commercial import CommercialResponse, CommercialCreate, CommercialUpdate
+from app.report.matching.funcs import get_interested_clients
+from app.utils.serialization import ORJSONResponse
 
 
 router = APIRouter()
@@ -21,9 +25,9 @@ async def create_commercial_endpoint(current_user: Annotated[UserRead, Depends(g
                                      background_tasks: BackgroundTasks,
                                      commercial: CommercialCreate = Query(...),
                                      media: Optional[List[UploadFile]] = File(None)):
-    return await create_commercial(
+    return ORJSONResponse(await create_commercial(
         db=db, commercial=commercial, media=media if media else None,
-        current_user=current_user, background_tasks=background_tasks)
+        current_user=current_user, background_tasks=background_tasks))
 
 
 @router.get("/")
@@ -32,8 +36,10 @@ async def get_commercials_endpoint(
         db: Annotated[AsyncSession, Depends(get_async_session)],
         limit: int = Query(10, ge=1),
         page: int = Query(1, ge=1),
+        fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                  examples=[["card"], ["title", "price", "district"]]),
 ):
-    return await get_commercials(db, limit, page)
+    return ORJSONResponse(await get_commercials(db, limit, page, fields))
 
 
 @router.get("/{commercial_id}")
@@ -43,16 +49,35 @@ async def get_commercial_endpoint(current_user: Annotated[UserRead, Depends(get_
     return await get_commercial(db, commercial_id)
 
 
+@router.get("/{commercial_id}/similar")
+async def get_similar_commercials_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                           db: Annotated[AsyncSession, Depends(get_async_session)],
+                                           commercial_id: int,
+                                           limit: int = Query(10, ge=1, le=50),
+                                           fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                                                     examples=[["card"], ["title", "price", "district"]])):
+    return ORJSONResponse(await similar_objects(db, 'commercial', commercial_id, limit, fields))
+
+
+@router.get("/{commercial_id}/interested-clients")
+async def get_interested_clients_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                          db: Annotated[AsyncSession, Depends(get_async_session)],
+                                          commercial_id: int,
+                                          limit: int = Query(10, ge=1),
+                                          page: int = Query(1, ge=1)):
+    return ORJSONResponse(await get_interested_clients(db, Category.COMMERCIAL, commercial_id, limit, page))
+
+
 @router.put("/{commercial_id}")
 async def update_commercial_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
                                      db: Annotated[AsyncSession, Depends(get_async_session)],
                                      background_tasks: BackgroundTasks,
                                      commercial_id: int, commercial: CommercialUpdate = Query(...),
                                      media: Optional[List[UploadFile]] = File(None)):
-    return await update_commercial(
+    return ORJSONResponse(await update_commercial(
         db=db, commercial_id=commercial_id, commercial=commercial,
         user=current_user, media=media if media else None,
-        background_tasks=background_tasks)
+        background_tasks=background_tasks))
 
 
 @router.delete("/{commercial_id}")
@@ -3,12 +3,16 @@ from typing import List, Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.additional.similar import similar_objects
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
 from app.database import get_async_session
 
+from app.object.models import Category
 from app.object.functions.land import create_land, get_lands, get_land, update_land, delete_land
 from app.object.schemas.land import LandUpdate, LandCreate, LandResponse
+from app.report.matching.funcs import get_interested_clients
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter()
 
@@ -19,8 +23,8 @@ async def create_land_endpoint(current_user: Annotated[UserRead, Depends(get_cur
                                background_tasks: BackgroundTasks,
                                land: LandCreate = Query(...),
                                media: Optional[List[UploadFile]] = File(None)):
-    return await create_land(db=db, land=land, media=media if media else None,
-                             current_user=current_user, background_tasks=background_tasks)
+    return ORJSONResponse(await create_land(db=db, land=land, media=media if media else None,
+                                            current_user=current_user, background_tasks=background_tasks))
 
 
 @router.get("/")
@@ -29,8 +33,10 @@ async def get_lands_endpoint(
         db: Annotated[AsyncSession, Depends(get_async_session)],
         limit: int = Query(10, ge=1),
         page: int = Query(1, ge=1),
+        fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                  examples=[["card"], ["title", "price", "district"]]),
 ):
-    return await get_lands(db, limit, page)
+    return ORJSONResponse(await get_lands(db, limit, page, fields))
 
 
 @router.get("/{land_id}")
@@ -40,14 +46,33 @@ async def get_land_endpoint(current_user: Annotated[UserRead, Depends(get_curren
     return await get_land(db, land_id)
 
 
+@router.get("/{land_id}/similar")
+async def get_similar_lands_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                     db: Annotated[AsyncSession, Depends(get_async_session)],
+                                     land_id: int,
+                                     limit: int = Query(10, ge=1, le=50),
+                                     fields: List[str] = Query(None, description="Columns to return instead of the full object. 'card' for a list card",
+                                                               examples=[["card"], ["title", "price", "district"]])):
+    return ORJSONResponse(await similar_objects(db, 'land', land_id, limit, fields))
+
+
+@router.get("/{land_id}/interested-clients")
+async def get_interested_clients_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
+                                          db: Annotated[AsyncSession, Depends(get_async_session)],
+                                          land_id: int,
+                                          limit: int = Query(10, ge=1),
+                                          page: int = Query(1, ge=1)):
+    return ORJSONResponse(await get_interested_clients(db, Category.LAND, land_id, limit, page))
+
+
 @router.put("/{land_id}")
 async def update_land_endpoint(current_user: Annotated[UserRead, Depends(get_current_active_user)],
                                db: Annotated[AsyncSession, Depends(get_async_session)],
                                background_tasks: BackgroundTasks,
                                land_id: int, land: LandUpdate = Query(...),
                                media: Optional[List[UploadFile]] = File(None)):
-    return await update_land(db=db, land_id=land_id, land=land, user=current_user,
-                             media=media if media else None, background_tasks=background_tasks)
+    return ORJSONResponse(await update_land(db=db, land_id=land_id, land=land, user=current_user,
+                                            media=media if media else None, background_tasks=background_tasks))
 
 
 @router.delete("/{land_id}")
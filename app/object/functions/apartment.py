@@ -2,20 +2,21 @@ import os
 from typing import Optional, List
 
 from fastapi import HTTPException, status, UploadFile, BackgroundTasks
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.bot.handlers import send_message_to_channel
-from app.object.functions import generate_crm_id
 from app.object.functions.validations.validate_media import validate_media
 from app.object.messages import send_rent_apart, send_sale_apart
 from app.object.models import CurrentStatus, ActionType
 from app.object.models.apartment import Apartment, ApartmentMedia
 from app.object.schemas.apartment import ApartmentCreate, ApartmentUpdate, ApartmentResponse
-from app.utils.file_utils import save_upload_file
+from app.utils.file_utils import discard_files, publish_files, save_upload_file
+from app.utils.projection import projection
 
 from app.object.functions.validations.validate_apartment import validate_apartment
 from app.config import CHANNEL_RENT_ID, CHANNEL_SALE_ID
@@ -29,10 +30,12 @@ async def create_apartment(
         background_tasks: BackgroundTasks = None):
 
     await validate_apartment(db, apartment)
+    if media:
+        await validate_media(media)
 
+    urls = []
     try:
 
-        apartment.crm_id = await generate_crm_id(db, Apartment, 'A')
         apartment.responsible = current_user.full_name
         apartment.agent_commission = apartment.agent_percent * apartment.price / 100
         if apartment.second_responsible and apartment.second_agent_percent:
@@ -41,54 +44,60 @@ async def create_apartment(
         if apartment.current_status == CurrentStatus.FREE:
             apartment.status_date = None
 
-        db_apartment = Apartment(**apartment.model_dump())
+        db_apartment = Apartment(**apartment.model_dump(exclude={'crm_id'}))
         db.add(db_apartment)
-        await db.commit()
-        await db.refresh(db_apartment)
+        # INSERT ... RETURNING id, crm_id: the media file names need the id
+        await db.flush()
 
+        media_rows = []
         if media:
-            await validate_media(media)
-
-            urls = save_upload_file(media, db_apartment.id, 'apartment')
-            for url in urls:
-                db_apartment_media = ApartmentMedia(apartment_id=db_apartment.id, url=url['url'], media_type=url['media_type'])
-                db.add(db_apartment_media)
-                db_apartment.media.append(db_apartment_media)
+            urls = await save_upload_file(media, db_apartment.id, 'apartment')
+            media_rows = [ApartmentMedia(apartment_id=db_apartment.id, url=url['url'], media_type=url['media_type'])
+                          for url in urls]
+            db.add_all(media_rows)
 
+        # The media rows go out as one executemany and are committed together with the object.
+        # Files are moved out of staging only once the commit went through
         await db.commit()
-        await db.refresh(db_apartment)
-
-        if db_apartment.action_type == ActionType.RENT:
-            message = await send_rent_apart(db_apartment)
-        else:
-            message = await send_sale_apart(db_apartment, current_user.phone)
-
-        background_tasks.add_task(send_message_to_channel, message, db_apartment.media,
-                                  CHANNEL_RENT_ID if db_apartment.action_type == ActionType.RENT else CHANNEL_SALE_ID)
-
-        apartment_response = ApartmentResponse.model_validate(db_apartment)
-        return jsonable_encoder(apartment_response)
 
     except IntegrityError as e:
+        await db.rollback()
+        discard_files(urls)
         if 'duplicate key value violates unique constraint' in str(e):
             print(e)
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Квартира с таким номером уже существует")
         raise
     except Exception as e:
+        await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Произошла ошибка: {str(e)}")
-    pass
 
+    publish_files(urls)
+    set_committed_value(db_apartment, 'media', media_rows)
+
+    if db_apartment.action_type == ActionType.RENT:
+        message = await send_rent_apart(db_apartment)
+    else:
+        message = await send_sale_apart(db_apartment, current_user.phone)
 
-async def get_apartments(db: AsyncSession, limit: int = 10, page: int = 1):
+    background_tasks.add_task(send_message_to_channel, message, db_apartment.media,
+                              CHANNEL_RENT_ID if db_apartment.action_type == ActionType.RENT else CHANNEL_SALE_ID)
+
+    return ApartmentResponse.model_validate(db_apartment)
+
+
+async def get_apartments(db: AsyncSession, limit: int = 10, page: int = 1, fields: Optional[List[str]] = None):
+    columns = projection(inspect(Apartment).columns, fields)
     total_count = await db.scalar(select(func.count(Apartment.id)))
-    result = await db.execute(select(Apartment).order_by(Apartment.id.desc()).limit(limit).offset((page - 1) * limit))
-    apartment = result.scalars().all()
+    stmt = select(*columns) if columns else select(Apartment).options(selectinload(Apartment.media))
+    result = await db.execute(stmt.order_by(Apartment.id.desc()).limit(limit).offset((page - 1) * limit))
+    apartment = result.mappings().all() if columns else result.scalars().all()
 
     return {"data": apartment if apartment else [], "total_count": total_count}
 
 
 async def get_apartment(db: AsyncSession, apartment_id: int):
-    result = await db.execute(select(Apartment).filter_by(id=apartment_id))
+    result = await db.execute(select(Apartment).options(selectinload(Apartment.media)).filter_by(id=apartment_id))
     apartment = result.scalars().first()
     if not apartment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Квартира не найдена")
@@ -110,6 +119,9 @@ async def update_apartment(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Этот объект может изменить только ответственный')
 
     await validate_apartment(db, apartment)
+    if media and media[0].filename != '':
+        await validate_media(media)
+    urls = []
     try:
         if apartment.agent_percent and apartment.price:
             apartment.agent_commission = apartment.agent_percent * apartment.price / 100
@@ -122,36 +134,33 @@ async def update_apartment(
 
         if media and len(media) > 0:
             if not media[0].filename == '':
-
-                await validate_media(media)
-
                 last_media = db_apartment.media[-1].url if db_apartment.media else None
                 if last_media:
                     name, ext = last_media.rsplit('.', 1)
 
-                urls = save_upload_file(media, db_apartment.id, 'apartment', name[-1] if last_media else None)
-                for url in urls:
-                    db_apartment_media = ApartmentMedia(apartment_id=db_apartment.id, url=url['url'],
-                                                        media_type=url['media_type'])
-                    db.add(db_apartment_media)
-                    db_apartment.media.append(db_apartment_media)
+                urls = await save_upload_file(media, db_apartment.id, 'apartment', name[-1] if last_media else None)
+                db.add_all([ApartmentMedia(apartment_id=db_apartment.id, url=url['url'], media_type=url['media_type'])
+                            for url in urls])
 
         for key, value in apartment.model_dump(exclude_unset=True).items():
             setattr(db_apartment, key, value)
 
         await db.commit()
-        await db.refresh(db_apartment)
-
-        apartment_response = ApartmentResponse.model_validate(db_apartment)
-        return jsonable_encoder(apartment_response)
 
     except IntegrityError as e:
         await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+    publish_files(urls)
+    await db.refresh(db_apartment, ['media'])
+
+    return ApartmentResponse.model_validate(db_apartment)
+
 
 async def delete_apartment(db: AsyncSession, apartment_id: int):
     db_apartment = await get_apartment(db, apartment_id)
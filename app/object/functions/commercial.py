@@ -2,21 +2,22 @@ import os
 from typing import Optional, List
 
 from fastapi import HTTPException, status, UploadFile, BackgroundTasks
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.bot.handlers import send_message_to_channel
 from app.config import CHANNEL_RENT_ID, CHANNEL_SALE_ID
-from app.object.functions import generate_crm_id
 from app.object.functions.validations.validate_media import validate_media
 from app.object.messages import send_sale_comm, send_rent_comm
 from app.object.models import CurrentStatus, ActionType
 from app.object.models.commercial import CommercialMedia, Commercial
 from app.object.schemas.commercial import CommercialCreate, CommercialResponse, CommercialUpdate
-from app.utils.file_utils import save_upload_file
+from app.utils.file_utils import discard_files, publish_files, save_upload_file
+from app.utils.projection import projection
 
 from app.object.functions.validations.validate_commercial import validate_commercial
 
@@ -29,10 +30,12 @@ async def create_commercial(
 ):
 
     await validate_commercial(db, commercial)
+    if media:
+        await validate_media(media)
 
+    urls = []
     try:
 
-        commercial.crm_id = await generate_crm_id(db, Commercial, 'C')
         commercial.responsible = current_user.full_name
         commercial.agent_commission = commercial.agent_percent * commercial.price / 100
         if commercial.second_responsible and commercial.second_agent_percent:
@@ -41,50 +44,55 @@ async def create_commercial(
         if commercial.current_status == CurrentStatus.FREE:
             commercial.status_date = None
 
-        db_commercial = Commercial(**commercial.model_dump())
+        db_commercial = Commercial(**commercial.model_dump(exclude={'crm_id'}))
         db.add(db_commercial)
-        await db.commit()
-        await db.refresh(db_commercial)
+        # INSERT ... RETURNING id, crm_id: the media file names need the id
+        await db.flush()
 
+        media_rows = []
         if media:
-            await validate_media(media)
-
-            urls = save_upload_file(media, db_commercial.id, 'commercial')
-            for url in urls:
-                db_commercial_media = CommercialMedia(commercial_id=db_commercial.id, url=url['url'],
-                                                      media_type=url['media_type'])
-                db.add(db_commercial_media)
-                db_commercial.media.append(db_commercial_media)
+            urls = await save_upload_file(media, db_commercial.id, 'commercial')
+            media_rows = [CommercialMedia(commercial_id=db_commercial.id, url=url['url'], media_type=url['media_type'])
+                          for url in urls]
+            db.add_all(media_rows)
 
+        # The media rows go out as one executemany and are committed together with the object.
+        # Files are moved out of staging only once the commit went through
         await db.commit()
-        await db.refresh(db_commercial)
-
-        if db_commercial.action_type == ActionType.RENT:
-            message = await send_rent_comm(db_commercial)
-        else:
-            message = await send_sale_comm(db_commercial, current_user.phone)
-
-        background_tasks.add_task(send_message_to_channel, message, db_commercial.media,
-                                  CHANNEL_RENT_ID if db_commercial.action_type == ActionType.RENT else CHANNEL_SALE_ID)
-
-        commercial_response = CommercialResponse.model_validate(db_commercial)
-        return jsonable_encoder(commercial_response)
 
     except IntegrityError as e:
+        await db.rollback()
+        discard_files(urls)
         if 'duplicate key value violates unique constraint' in str(e):
             print(e)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Коммерческий объект с таким номером уже существует")
         raise
     except Exception as e:
+        await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Произошла ошибка: {str(e)}")
 
+    publish_files(urls)
+    set_committed_value(db_commercial, 'media', media_rows)
+
+    if db_commercial.action_type == ActionType.RENT:
+        message = await send_rent_comm(db_commercial)
+    else:
+        message = await send_sale_comm(db_commercial, current_user.phone)
 
-async def get_commercials(db: AsyncSession, limit: int = 10, page: int = 1):
+    background_tasks.add_task(send_message_to_channel, message, db_commercial.media,
+                              CHANNEL_RENT_ID if db_commercial.action_type == ActionType.RENT else CHANNEL_SALE_ID)
+
+    return CommercialResponse.model_validate(db_commercial)
+
+
+async def get_commercials(db: AsyncSession, limit: int = 10, page: int = 1, fields: Optional[List[str]] = None):
+    columns = projection(inspect(Commercial).columns, fields)
     try:
         total_count = await db.scalar(select(func.count(Commercial.id)))
-        result = await db.execute(
-            select(Commercial).order_by(Commercial.id.desc()).limit(limit).offset((page - 1) * limit))
-        commercials = result.scalars().all()
+        stmt = select(*columns) if columns else select(Commercial).options(selectinload(Commercial.media))
+        result = await db.execute(stmt.order_by(Commercial.id.desc()).limit(limit).offset((page - 1) * limit))
+        commercials = result.mappings().all() if columns else result.scalars().all()
 
         return {"data": commercials if commercials else [], "total_count": total_count}
     except Exception as e:
@@ -92,7 +100,7 @@ async def get_commercials(db: AsyncSession, limit: int = 10, page: int = 1):
 
 
 async def get_commercial(db: AsyncSession, commercial_id: int):
-    result = await db.execute(select(Commercial).filter_by(id=commercial_id))
+    result = await db.execute(select(Commercial).options(selectinload(Commercial.media)).filter_by(id=commercial_id))
     commercial = result.scalars().first()
     if not commercial:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Коммерческий объект не найден")
@@ -116,7 +124,10 @@ async def update_commercial(
                             detail="Этот объект может изменить только ответственный")
 
     await validate_commercial(db, commercial)
+    if media and media[0].filename != '':
+        await validate_media(media)
 
+    urls = []
     try:
         if commercial.agent_percent and commercial.price:
             commercial.agent_commission = commercial.agent_percent * commercial.price / 100
@@ -129,31 +140,30 @@ async def update_commercial(
 
         if media and len(media) > 0:
             if not media[0].filename == '':
-                await validate_media(media)
-
                 last_media = db_commercial.media[-1].url if db_commercial.media else None
 
                 if last_media:
                     name, ext = last_media.rsplit('.', 1)
 
-                urls = save_upload_file(media, db_commercial.id, 'commercial', name[-1] if last_media else None)
-                for url in urls:
-                    db_commercial_media = CommercialMedia(commercial_id=db_commercial.id, url=url['url'],
-                                                          media_type=url['media_type'])
-                    db.add(db_commercial_media)
-                    db_commercial.media.append(db_commercial_media)
+                urls = await save_upload_file(media, db_commercial.id, 'commercial', name[-1] if last_media else None)
+                db.add_all([CommercialMedia(commercial_id=db_commercial.id, url=url['url'], media_type=url['media_type'])
+                            for url in urls])
 
         for key, value in commercial.model_dump(exclude_unset=True).items():
             setattr(db_commercial, key, value)
 
         await db.commit()
-        await db.refresh(db_commercial)
 
-        commercial_response = CommercialResponse.model_validate(db_commercial)
-        return jsonable_encoder(commercial_response)
     except Exception as e:
+        await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+    publish_files(urls)
+    await db.refresh(db_commercial, ['media'])
+
+    return CommercialResponse.model_validate(db_commercial)
+
 
 async def delete_commercial(db: AsyncSession, commercial_id: int):
     db_commercial = await get_commercial(db, commercial_id)
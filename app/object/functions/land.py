@@ -2,21 +2,23 @@ import os
 from typing import Optional, List
 
 from fastapi import HTTPException, status, UploadFile, BackgroundTasks
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.bot.handlers import send_message_to_channel
 from app.config import CHANNEL_RENT_ID, CHANNEL_SALE_ID
-from app.object.functions import generate_crm_id, house_condition_translation
+from app.object.functions import house_condition_translation
 from app.object.functions.validations.validate_media import validate_media
 from app.object.messages import send_rent_land, send_sale_land
 from app.object.models import CurrentStatus, ActionType
 from app.object.models.land import LandMedia, Land
 from app.object.schemas.land import LandCreate, LandResponse, LandUpdate
-from app.utils.file_utils import save_upload_file
+from app.utils.file_utils import discard_files, publish_files, save_upload_file
+from app.utils.projection import projection
 
 from app.object.functions.validations.validate_land import validate_land
 
@@ -28,10 +30,12 @@ async def create_land(
 ):
 
     await validate_land(db, land)
+    if media:
+        await validate_media(media)
 
+    urls = []
     try:
 
-        land.crm_id = await generate_crm_id(db, Land, 'L')
         land.responsible = current_user.full_name
         land.agent_commission = land.agent_percent * land.price / 100
         if land.second_responsible and land.second_agent_percent:
@@ -40,48 +44,55 @@ async def create_land(
         if land.current_status == CurrentStatus.FREE:
             land.status_date = None
 
-        db_land = Land(**land.model_dump())
+        db_land = Land(**land.model_dump(exclude={'crm_id'}))
         db.add(db_land)
-        await db.commit()
-        await db.refresh(db_land)
+        # INSERT ... RETURNING id, crm_id: the media file names need the id
+        await db.flush()
 
+        media_rows = []
         if media:
-            await validate_media(media)
-
-            urls = save_upload_file(media, db_land.id, 'land')
-            for url in urls:
-                db_land_media = LandMedia(land_id=db_land.id, url=url['url'], media_type=url['media_type'])
-                db.add(db_land_media)
-                db_land.media.append(db_land_media)
+            urls = await save_upload_file(media, db_land.id, 'land')
+            media_rows = [LandMedia(land_id=db_land.id, url=url['url'], media_type=url['media_type'])
+                          for url in urls]
+            db.add_all(media_rows)
 
+        # The media rows go out as one executemany and are committed together with the object.
+        # Files are moved out of staging only once the commit went through
         await db.commit()
-        await db.refresh(db_land)
-
-        if db_land.action_type == ActionType.RENT:
-            message = await send_rent_land(db_land)
-        else:
-            message = await send_sale_land(db_land, current_user.phone)
-
-        background_tasks.add_task(send_message_to_channel, message, db_land.media,
-                                  CHANNEL_RENT_ID if db_land.action_type == ActionType.RENT else CHANNEL_SALE_ID)
-
-        land_response = LandResponse.model_validate(db_land)
-        return jsonable_encoder(land_response)
 
     except IntegrityError as e:
+        await db.rollback()
+        discard_files(urls)
         if 'duplicate key value violates unique constraint' in str(e):
             print(e)
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Земельный участок с таким номером уже существует")
         raise
     except Exception as e:
+        await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Произошла ошибка: {str(e)}")
 
+    publish_files(urls)
+    set_committed_value(db_land, 'media', media_rows)
+
+    if db_land.action_type == ActionType.RENT:
+        message = await send_rent_land(db_land)
+    else:
+        message = await send_sale_land(db_land, current_user.phone)
+
+    background_tasks.add_task(send_message_to_channel, message, db_land.media,
+                              CHANNEL_RENT_ID if db_land.action_type == ActionType.RENT else CHANNEL_SALE_ID)
 
-async def get_lands(db: AsyncSession, limit: int = 10, page: int = 1):
+    return LandResponse.model_validate(db_land)
+
+
+async def get_lands(db: AsyncSession, limit: int = 10, page: int = 1, fields: Optional[List[str]] = None):
+    columns = projection(inspect(Land).columns, fields)
     try:
         total_count = await db.scalar(select(func.count(Land.id)))
-        result = await db.execute(select(Land).order_by(Land.id.desc()).limit(limit).offset((page - 1) * limit))
-        lands = result.scalars().all()
+        stmt = select(*columns) if columns else select(Land).options(selectinload(Land.media))
+        result = await db.execute(stmt.order_by(Land.id.desc()).limit(limit).offset((page - 1) * limit))
+        lands = result.mappings().all() if columns else result.scalars().all()
 
         return {"data": lands if lands else [], "total_count": total_count}
     except Exception as e:
@@ -89,7 +100,7 @@ async def get_lands(db: AsyncSession, limit: int = 10, page: int = 1):
 
 
 async def get_land(db: AsyncSession, land_id: int):
-    result = await db.execute(select(Land).filter_by(id=land_id))
+    result = await db.execute(select(Land).options(selectinload(Land.media)).filter_by(id=land_id))
     land = result.scalars().first()
     if not land:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Земельный участок не найден")
@@ -111,6 +122,9 @@ async def update_land(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Этот объект может изменить только ответственный')
 
     await validate_land(db, land)
+    if media and media[0].filename != '':
+        await validate_media(media)
+    urls = []
     try:
 
         if land.agent_percent and land.price:
@@ -124,31 +138,30 @@ async def update_land(
 
         if media and len(media) > 0:
             if not media[0].filename == '':
-                await validate_media(media)
-
                 last_media = db_land.media[-1].url if db_land.media else None
                 if last_media:
                     name, ext = last_media.rsplit('.', 1)
 
-                urls = save_upload_file(media, db_land.id, 'land', name[-1] if last_media else None)
-                for url in urls:
-                    db_land_media = LandMedia(land_id=db_land.id, url=url['url'], media_type=url['media_type'])
-                    db.add(db_land_media)
-                    db_land.media.append(db_land_media)
+                urls = await save_upload_file(media, db_land.id, 'land', name[-1] if last_media else None)
+                db.add_all([LandMedia(land_id=db_land.id, url=url['url'], media_type=url['media_type'])
+                            for url in urls])
 
         for key, value in land.model_dump(exclude_unset=True).items():
             setattr(db_land, key, value)
 
         db.add(db_land)
         await db.commit()
-        await db.refresh(db_land)
-
-        land_response = LandResponse.model_validate(db_land)
-        return jsonable_encoder(land_response)
 
     except Exception as e:
+        await db.rollback()
+        discard_files(urls)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+    publish_files(urls)
+    await db.refresh(db_land, ['media'])
+
+    return LandResponse.model_validate(db_land)
+
 
 async def delete_land(db: AsyncSession, land_id: int):
     db_land = await get_land(db, land_id)
@@ -1,23 +1,19 @@
 from fastapi import HTTPException, status
-from sqlalchemy.future import select
 
-from app.district.model import District
-from app.metro.model import Metro
+from app.utils.reference_data import district_names, metro_names
 
 
 async def validate_apartment(db, apartment):
-    if apartment.district:
-        result = await db.execute(select(District).filter_by(name=apartment.district))
-        district = result.scalars().first()
-        if not district:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект района не найден")
-
-    if apartment.metro_st:
-        result = await db.execute(select(Metro).filter_by(name=apartment.metro_st))
-        metro = result.scalars().first()
-        if not metro:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект метро не найден")
+    if apartment.district and apartment.district not in await district_names(db, apartment.district):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект района не найден")
 
+    if apartment.metro_st and apartment.metro_st not in await metro_names(db, apartment.metro_st):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект метро не найден")
+
+    validate_apartment_fields(apartment)
+
+
+def validate_apartment_fields(apartment):
     if apartment.price:
         if apartment.price <= 0:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Цена должна быть больше 0")
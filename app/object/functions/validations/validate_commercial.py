@@ -1,16 +1,16 @@
 from fastapi import HTTPException, status
-from sqlalchemy.future import select
 
-from app.district.model import District
+from app.utils.reference_data import district_names
 
 
 async def validate_commercial(db, commercial):
-    if commercial.district:
-        result = await db.execute(select(District).filter_by(name=commercial.district))
-        district = result.scalars().first()
-        if not district:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Район объекта не найден")
+    if commercial.district and commercial.district not in await district_names(db, commercial.district):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Район объекта не найден")
 
+    validate_commercial_fields(commercial)
+
+
+def validate_commercial_fields(commercial):
     if commercial.price:
         if commercial.price <= 0:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Цена объекта должна быть больше 0")
@@ -1,16 +1,16 @@
 from fastapi import HTTPException, status
-from sqlalchemy.future import select
 
-from app.district.model import District
+from app.utils.reference_data import district_names
 
 
 async def validate_land(db, land):
-    if land.district:
-        result = await db.execute(select(District).filter_by(name=land.district))
-        district = result.scalars().first()
-        if not district:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Район объекта не найден")
+    if land.district and land.district not in await district_names(db, land.district):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Район объекта не найден")
 
+    validate_land_fields(land)
+
+
+def validate_land_fields(land):
     if land.price:
         if land.price <= 0:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Цена объекта должна быть больше 0")
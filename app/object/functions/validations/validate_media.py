@@ -1,20 +1,42 @@
+from typing import Optional
+
 from fastapi import HTTPException, status
 
-from app.config import MAX_VIDEO_SIZE, MAX_IMAGE_SIZE
+from app.config import MAX_VIDEO_SIZE, MAX_IMAGE_SIZE, MEDIA_CHUNK
+
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a')
+VIDEO_SIGNATURES = (b'\x1a\x45\xdf\xa3',)  # WebM / Matroska
+# ISO media files (MP4, MOV, HEIC, AVIF) share the "ftyp" box, the brand after it tells images from videos
+IMAGE_BRANDS = (b'heic', b'heix', b'hevc', b'heim', b'heis', b'mif1', b'msf1', b'avif', b'avis')
+
+
+def sniff_media_type(head: bytes) -> Optional[str]:
+    if head.startswith(IMAGE_SIGNATURES) or (head[:4] == b'RIFF' and head[8:12] == b'WEBP'):
+        return "image"
+    if head.startswith(VIDEO_SIGNATURES) or (head[:4] == b'RIFF' and head[8:12] == b'AVI '):
+        return "video"
+    if head[4:8] == b'ftyp':
+        return "image" if head[8:12] in IMAGE_BRANDS else "video"
+    return None
 
 
 async def validate_media(media):
     for file in media:
         media_type = "image" if file.content_type.startswith("image") else "video"
-        file_size = await file.read()
-        if media_type == "video":
-            if len(file_size) > MAX_VIDEO_SIZE:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                    detail="Размер видеофайла слишком большой")
-        elif media_type == "image":
-            if len(file_size) > MAX_IMAGE_SIZE:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                    detail="Размер изображения слишком большой")
-        else:
+        max_size = MAX_VIDEO_SIZE if media_type == "video" else MAX_IMAGE_SIZE
+
+        # The file is read chunk by chunk and dropped as soon as it is over the limit,
+        # so only one chunk per upload is ever held in memory
+        chunk = await file.read(MEDIA_CHUNK)
+        if sniff_media_type(chunk) != media_type:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Неверный формат файла")
+
+        file_size = 0
+        while chunk:
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail="Размер видеофайла слишком большой" if media_type == "video"
+                                    else "Размер изображения слишком большой")
+            chunk = await file.read(MEDIA_CHUNK)
         await file.seek(0)
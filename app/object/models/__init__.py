@@ -57,3 +57,7 @@ class CurrentStatus(Enum):
     BUSY = 'busy'
 
 
+SEARCH_VECTOR = ("setweight(to_tsvector('simple', coalesce(crm_id, '') || ' ' || coalesce(title, '')), 'A') || "
+                 "setweight(to_tsvector('simple', coalesce(district, '')), 'B') || "
+                 "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+                 "setweight(to_tsvector('simple', coalesce(comment, '')), 'D')")
@@ -1,11 +1,12 @@
 import datetime
 
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Integer, String, TIMESTAMP, Boolean, Enum, ForeignKey, Float
+from sqlalchemy import Column, Computed, Index, Sequence, text, Integer, String, TIMESTAMP, Boolean, Enum, ForeignKey, Float
 
 from app.database import Base
 
-from app.object.models import Category, ActionType, LocationCommercial, HouseCondition, CurrentStatus
+from app.object.models import SEARCH_VECTOR, Category, ActionType, LocationCommercial, HouseCondition, CurrentStatus
 
 
 class CommercialMedia(Base):
@@ -16,7 +17,7 @@ class CommercialMedia(Base):
     media_type: Mapped[str] = mapped_column(String, nullable=True)
     commercial_id: Mapped[int] = mapped_column(Integer, ForeignKey('commercial.id'))
 
-    commercial: Mapped['Commercial'] = relationship(back_populates='media', lazy='selectin')
+    commercial: Mapped['Commercial'] = relationship(back_populates='media', lazy='raise')
 
     created_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True),
                                                           default=lambda: datetime.datetime.now(datetime.timezone.utc))
@@ -25,12 +26,32 @@ class CommercialMedia(Base):
                                                           onupdate=lambda: datetime.datetime.now(datetime.timezone.utc))
 
 
+commercial_crm_id_seq = Sequence('commercial_crm_id_seq', metadata=Base.metadata)
+
+
 class Commercial(Base):
     __tablename__ = 'commercial'
+    __table_args__ = (
+        Column('search_vector', TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)),
+        Index('ix_commercial_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_commercial_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_commercial_crm_id_trgm', 'crm_id', postgresql_using='gin', postgresql_ops={'crm_id': 'gin_trgm_ops'}),
+        Index('ix_commercial_crm_id_prefix', 'crm_id', postgresql_ops={'crm_id': 'varchar_pattern_ops'}),
+        Index('ix_commercial_action_type_district_price', 'action_type', 'district', 'price'),
+        Index('ix_commercial_action_type_rooms_square_area', 'action_type', 'rooms', 'square_area'),
+        Index('ix_commercial_responsible_created_at', 'responsible', 'created_at'),
+        Index('ix_commercial_created_at', 'created_at'),
+        Index('ix_commercial_updated_at', 'updated_at'),
+        Index('ix_commercial_current_status_status_date', 'current_status', 'status_date',
+              postgresql_where=text('current_status IS NOT NULL')),
+    )
+    __mapper_args__ = {'exclude_properties': ['search_vector'], 'eager_defaults': True}
 
     # ID of the land
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    crm_id: Mapped[str] = mapped_column(String(length=255), unique=True)
+    # Assigned by the INSERT from a per-table sequence and returned with it, so parallel creates never collide
+    crm_id: Mapped[str] = mapped_column(String(length=255), unique=True,
+                                        server_default=text("'C' || nextval('commercial_crm_id_seq')"))
 
     # Location of the land
     district: Mapped[str] = mapped_column(String(length=255))
@@ -39,7 +60,7 @@ class Commercial(Base):
     title: Mapped[str] = mapped_column(String(length=50))
     category: Mapped[Category] = mapped_column(Enum(Category), default=Category.COMMERCIAL)
     action_type: Mapped[ActionType] = mapped_column(Enum(ActionType))
-    media: Mapped[list['CommercialMedia']] = relationship(back_populates='commercial', lazy='selectin')
+    media: Mapped[list['CommercialMedia']] = relationship(back_populates='commercial', lazy='raise')
     description: Mapped[str] = mapped_column(String(length=6000), nullable=True)
     comment: Mapped[str] = mapped_column(String(length=6000), nullable=True)
     price: Mapped[int] = mapped_column(Integer)
@@ -0,0 +1,26 @@
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.schema import UserRead
+from app.auth.utils import get_current_active_user
+from app.object.models import ActionType, Category
+from app.report.analytics.funcs import price_statistics
+from app.utils.serialization import ORJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/prices")
+async def get_price_statistics_endpoint(
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    category: Optional[Category] = Query(None, description="Категория объекта"),
+    action_type: Optional[ActionType] = Query(None, description="Аренда или продажа"),
+    district: Optional[List[str]] = Query(None, description="Районы"),
+    rooms: Optional[int] = Query(None, description="Количество комнат"),
+    date_min: Optional[str] = Query(None, description="Дата создания от, в формате YYYY-MM-DD"),
+    date_max: Optional[str] = Query(None, description="Дата создания до, в формате YYYY-MM-DD"),
+    metric: str = Query("price_per_m2", description="price, price_per_m2 или square_area"),
+    bins: int = Query(20, ge=1, le=200, description="Количество столбцов гистограммы"),
+):
+    return ORJSONResponse(price_statistics(category, action_type, district, rooms, date_min, date_max, metric, bins))
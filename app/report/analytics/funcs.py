@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.future import select
+
+from app.additional.listing import listing
+from app.config import ANALYTICS_REFRESH_INTERVAL
+from app.database import async_session_maker
+from app.object.models import ActionType, Category
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = list(Category)
+ACTION_TYPES = list(ActionType)
+METRICS = ('price', 'price_per_m2', 'square_area')
+PERCENTILES = {'p10': 10, 'median': 50, 'p90': 90}
+
+
+@dataclass
+class ColumnarSnapshot:
+    version: int = 0
+    built_at: Optional[datetime.datetime] = None
+    districts: list[str] = field(default_factory=list)
+    category: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int8))
+    district: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    action_type: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int8))
+    price: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    square_area: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    rooms: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int16))
+    created_at: np.ndarray = field(default_factory=lambda: np.empty(0, dtype='datetime64[s]'))
+
+
+snapshot = ColumnarSnapshot()
+
+
+def build_snapshot(rows: list, version: int) -> ColumnarSnapshot:
+    categories, districts, action_types, prices, areas, rooms, created_at = zip(*rows) if rows else ([],) * 7
+    district_names, district_codes = np.unique(np.array(districts, dtype=str), return_inverse=True)
+    category_codes = {value: code for code, value in enumerate(CATEGORIES)}
+    action_type_codes = {value: code for code, value in enumerate(ACTION_TYPES)}
+
+    return ColumnarSnapshot(
+        version=version,
+        built_at=datetime.datetime.now(datetime.timezone.utc),
+        districts=district_names.tolist(),
+        category=np.array([category_codes[value] for value in categories], dtype=np.int8),
+        district=district_codes.astype(np.int32),
+        action_type=np.array([action_type_codes[value] for value in action_types], dtype=np.int8),
+        price=np.array(prices, dtype=np.float64),
+        square_area=np.array(areas, dtype=np.float64),
+        rooms=np.array(rooms, dtype=np.int16),
+        created_at=np.array([value.astimezone(datetime.timezone.utc).replace(tzinfo=None) for value in created_at],
+                            dtype='datetime64[s]'),
+    )
+
+
+async def refresh_snapshot():
+    global snapshot
+
+    async with async_session_maker() as db:
+        result = await db.execute(select(listing.c.category, listing.c.district, listing.c.action_type, listing.c.price,
+                                         listing.c.square_area, listing.c.rooms, listing.c.created_at))
+        rows = result.all()
+
+    # Built aside in a worker thread and swapped in with one assignment, so readers never see a partial snapshot
+    snapshot = await asyncio.to_thread(build_snapshot, rows, snapshot.version + 1)
+
+
+async def refresh_snapshot_periodically():
+    while True:
+        try:
+            await refresh_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to refresh analytics snapshot: {e}")
+        await asyncio.sleep(ANALYTICS_REFRESH_INTERVAL)
+
+
+def metric_values(data: ColumnarSnapshot, metric: str) -> np.ndarray:
+    if metric == 'price':
+        return data.price
+    if metric == 'square_area':
+        return data.square_area
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(data.square_area > 0, data.price / data.square_area, np.nan)
+
+
+def summary(values: np.ndarray) -> dict:
+    if not values.size:
+        return {"count": 0, "min": None, **{name: None for name in PERCENTILES}, "max": None, "mean": None}
+    percentiles = np.percentile(values, list(PERCENTILES.values()))
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        **{name: float(value) for name, value in zip(PERCENTILES, percentiles)},
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+    }
+
+
+def group_percentiles(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # One sort by (group, value) gives every group's sorted run, percentiles are then interpolated per run at once
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+
+    result = np.empty((len(groups), len(PERCENTILES)))
+    for column, percentile in enumerate(PERCENTILES.values()):
+        position = starts + (counts - 1) * percentile / 100
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + counts - 1)
+        result[:, column] = values[low] + (values[high] - values[low]) * (position - low)
+    return groups, counts, result
+
+
+def price_statistics(category: Optional[Category] = None, action_type: Optional[ActionType] = None,
+                     district: Optional[list[str]] = None, rooms: Optional[int] = None,
+                     date_min: Optional[str] = None, date_max: Optional[str] = None,
+                     metric: str = 'price_per_m2', bins: int = 20):
+    if metric not in METRICS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Неверная метрика")
+
+    data = snapshot
+    if data.built_at is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Статистика еще не готова")
+
+    values = metric_values(data, metric)
+    mask = ~np.isnan(values)
+    if category:
+        mask &= data.category == CATEGORIES.index(category)
+    if action_type:
+        mask &= data.action_type == ACTION_TYPES.index(action_type)
+    if district:
+        mask &= np.isin(data.district, [data.districts.index(name) for name in district if name in data.districts])
+    if rooms is not None:
+        mask &= data.rooms == rooms
+    try:
+        if date_min:
+            mask &= data.created_at >= np.datetime64(datetime.datetime.strptime(date_min, '%Y-%m-%d'), 's')
+        if date_max:
+            mask &= data.created_at < np.datetime64(datetime.datetime.strptime(date_max, '%Y-%m-%d')
+                                                    + datetime.timedelta(days=1), 's')
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Неверный формат даты. Ожидается YYYY-MM-DD")
+
+    selected = values[mask]
+    counts, edges = np.histogram(selected, bins=bins) if selected.size else (np.zeros(0, dtype=np.int64), np.zeros(0))
+
+    # Category, district and action type packed into one integer key per row
+    keys = ((data.category[mask].astype(np.int64) * len(data.districts) + data.district[mask]) * len(ACTION_TYPES)
+            + data.action_type[mask])
+    groups, group_counts, group_values = group_percentiles(keys, selected)
+    group_action_types = groups % len(ACTION_TYPES)
+    group_districts = groups // len(ACTION_TYPES) % max(len(data.districts), 1)
+    group_categories = groups // len(ACTION_TYPES) // max(len(data.districts), 1)
+
+    return {
+        "version": data.version,
+        "built_at": data.built_at,
+        "age_seconds": round((datetime.datetime.now(datetime.timezone.utc) - data.built_at).total_seconds(), 1),
+        "metric": metric,
+        "summary": summary(selected),
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        "groups": [
+            {
+                "category": CATEGORIES[category_code].value,
+                "district": data.districts[district_code],
+                "action_type": ACTION_TYPES[action_code].value,
+                "count": int(count),
+                **{name: float(value) for name, value in zip(PERCENTILES, row)},
+            }
+            for category_code, district_code, action_code, count, row
+            in zip(group_categories, group_districts, group_action_types, group_counts, group_values)
+        ],
+    }
@@ -8,7 +8,9 @@ from app.auth.utils import get_current_active_user
 from app.object.models import ActionType
 from app.report.clients.crud import create_client, get_clients, get_client, update_client, delete_client
 from app.report.clients.schema import ClientCreate, ClientResponse, ClientUpdate
+from app.report.matching.funcs import get_client_matches
 from app.database import get_async_session
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter()
 
@@ -29,7 +31,7 @@ async def get_clients_endpoint(
     page: int = 1,
     db: AsyncSession = Depends(get_async_session),
 ):
-    return await get_clients(db, action_type, limit, page)
+    return ORJSONResponse(await get_clients(db, action_type, limit, page))
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
@@ -41,6 +43,17 @@ async def get_client_endpoint(
     return await get_client(db, client_id)
 
 
+@router.get("/{client_id}/matches")
+async def get_client_matches_endpoint(
+    client_id: int,
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    limit: int = 10,
+    page: int = 1,
+    db: AsyncSession = Depends(get_async_session),
+):
+    return ORJSONResponse(await get_client_matches(db, client_id, limit, page))
+
+
 @router.put("/{client_id}", response_model=ClientResponse)
 async def update_client_endpoint(
     client_id: int,
@@ -1,7 +1,7 @@
 import datetime
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, Enum, TIMESTAMP, JSON
+from sqlalchemy import Integer, String, Enum, TIMESTAMP, JSON, Index
 from app.object.models import ActionType
 from enum import Enum as enumEnum
 
@@ -23,6 +23,9 @@ class DealStatus(enumEnum):
 
 class Client(Base):
     __tablename__ = 'client'
+    __table_args__ = (
+        Index('ix_client_updated_at', 'updated_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     action_type: Mapped[ActionType] = mapped_column(Enum(ActionType))
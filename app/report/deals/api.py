@@ -8,6 +8,7 @@ from app.auth.utils import get_current_active_user
 from app.object.models import ActionType
 from app.report.deals.crud import get_deals, get_deal, delete_deal
 from app.database import get_async_session
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter()
 
@@ -20,7 +21,7 @@ async def get_deals_endpoint(
     page: int = 1,
     db: AsyncSession = Depends(get_async_session),
 ):
-    return await get_deals(db, action_type, limit, page)
+    return ORJSONResponse(await get_deals(db, action_type, limit, page))
 
 
 @router.get("/{deal_id}")
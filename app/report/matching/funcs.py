@@ -0,0 +1,141 @@
+import asyncio
+import datetime
+import logging
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, cast, delete, exists, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.additional.listing import listing
+from app.config import MATCHING_INTERVAL, MATCHING_OVERLAP
+from app.database import async_session_maker, engine
+from app.object.models import Category, CurrentStatus
+from app.object.models.apartment import Apartment
+from app.object.models.commercial import Commercial
+from app.object.models.land import Land
+from app.report.clients.crud import get_client
+from app.report.clients.model import Client, DealStatus
+from app.report.matching.model import ClientMatch
+
+logger = logging.getLogger(__name__)
+
+category_mapping = {
+    Category.APARTMENT: Apartment,
+    Category.LAND: Land,
+    Category.COMMERCIAL: Commercial,
+}
+
+# Every worker process starts the job; only the one holding this advisory lock runs it
+MATCHING_LOCK_KEY = 51820017
+# Start of the last finished run. None until the first run, which rebuilds every match
+_last_run_at: Optional[datetime.datetime] = None
+
+
+def matches_select(model):
+    # A client without districts or budget is not restricted by them
+    districts = cast(Client.district, JSONB)
+    return select(Client.id, model.category, model.id).join(model, and_(
+        model.action_type == Client.action_type,
+        or_(Client.budget.is_(None), model.price <= Client.budget),
+        or_(func.jsonb_typeof(districts).is_distinct_from('array'), districts == literal_column("'[]'::jsonb"),
+            districts.has_key(model.district)),
+        model.current_status.is_distinct_from(CurrentStatus.BUSY),
+    )).where(Client.deal_status.is_distinct_from(DealStatus.DEAL))
+
+
+def insert_matches(stmt):
+    return insert(ClientMatch).from_select(['client_id', 'category', 'object_id'], stmt).on_conflict_do_nothing()
+
+
+async def rebuild_matches(db: AsyncSession):
+    await db.execute(delete(ClientMatch))
+    for model in category_mapping.values():
+        await db.execute(insert_matches(matches_select(model)))
+
+
+async def update_matches(db: AsyncSession, since: datetime.datetime):
+    # Only pairs with a client or an object changed since the last run are recomputed
+    changed_clients = select(Client.id).where(Client.updated_at > since)
+    await db.execute(delete(ClientMatch).where(ClientMatch.client_id.in_(changed_clients)))
+
+    for category, model in category_mapping.items():
+        changed_objects = select(model.id).where(model.updated_at > since)
+        await db.execute(delete(ClientMatch).where(ClientMatch.category == category,
+                                                   ClientMatch.object_id.in_(changed_objects)))
+        # Deleted objects leave no updated_at behind, so their matches are found by an anti-join
+        await db.execute(delete(ClientMatch).where(ClientMatch.category == category,
+                                                   ~exists().where(model.id == ClientMatch.object_id)))
+
+        await db.execute(insert_matches(matches_select(model).where(Client.updated_at > since)))
+        await db.execute(insert_matches(matches_select(model).where(model.updated_at > since)))
+
+
+async def refresh_matches():
+    global _last_run_at
+
+    run_at = datetime.datetime.now(datetime.timezone.utc)
+    async with async_session_maker() as db:
+        if _last_run_at is None:
+            await rebuild_matches(db)
+        else:
+            await update_matches(db, _last_run_at - datetime.timedelta(seconds=MATCHING_OVERLAP))
+        await db.commit()
+    _last_run_at = run_at
+
+
+async def refresh_matches_periodically():
+    while True:
+        try:
+            # The lock is held by this connection and released by Postgres when it closes, so if the holder
+            # dies another worker takes over on its next try
+            async with engine.connect() as lock_conn:
+                try:
+                    await lock_conn.execution_options(isolation_level='AUTOCOMMIT')
+                    while not await lock_conn.scalar(select(func.pg_try_advisory_lock(MATCHING_LOCK_KEY))):
+                        await asyncio.sleep(MATCHING_INTERVAL)
+
+                    while True:
+                        try:
+                            await refresh_matches()
+                        except Exception as e:
+                            logger.error(f"Failed to refresh client matches: {e}")
+                        await asyncio.sleep(MATCHING_INTERVAL)
+                        # A lost connection means a lost lock, the outer loop reconnects and competes for it again
+                        await lock_conn.exec_driver_sql('SELECT 1')
+                finally:
+                    # Closed rather than returned to the pool, where it would keep holding the lock
+                    await lock_conn.invalidate()
+        except Exception as e:
+            logger.error(f"Client matching lock connection failed: {e}")
+            await asyncio.sleep(MATCHING_INTERVAL)
+
+
+async def get_client_matches(db: AsyncSession, client_id: int, limit: int = 10, page: int = 1):
+    await get_client(db, client_id)
+
+    stmt = select(*listing.c, ClientMatch.matched_at).join(ClientMatch, and_(
+        ClientMatch.category == listing.c.category, ClientMatch.object_id == listing.c.id,
+    )).where(ClientMatch.client_id == client_id)
+    total_count = await db.scalar(stmt.with_only_columns(func.count(), maintain_column_froms=True))
+    result = await db.execute(stmt.order_by(ClientMatch.matched_at.desc(), listing.c.created_at.desc())
+                              .limit(limit).offset((page - 1) * limit))
+
+    return {"data": result.mappings().all(), "total_count": total_count}
+
+
+async def get_interested_clients(db: AsyncSession, category: Category, object_id: int, limit: int = 10,
+                                 page: int = 1):
+    model = category_mapping[category]
+    if not await db.scalar(select(model.id).filter_by(id=object_id)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Объект не найден")
+
+    stmt = select(Client).join(ClientMatch, ClientMatch.client_id == Client.id).where(
+        ClientMatch.category == category, ClientMatch.object_id == object_id)
+    total_count = await db.scalar(stmt.with_only_columns(func.count(), maintain_column_froms=True))
+    result = await db.execute(stmt.order_by(ClientMatch.matched_at.desc(), Client.id.desc())
+                              .limit(limit).offset((page - 1) * limit))
+
+    return {"data": result.scalars().all(), "total_count": total_count}
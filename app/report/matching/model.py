@@ -0,0 +1,22 @@
+import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, Enum, TIMESTAMP, ForeignKey, Index
+
+from app.database import Base
+from app.object.models import Category
+
+
+class ClientMatch(Base):
+    __tablename__ = 'client_match'
+    __table_args__ = (
+        Index('ix_client_match_category_object_id', 'category', 'object_id'),
+    )
+
+    client_id: Mapped[int] = mapped_column(Integer, ForeignKey('client.id', ondelete='CASCADE'), primary_key=True)
+    # object_id points into the table named by category, so deleted objects are cleaned up by the matching job
+    category: Mapped[Category] = mapped_column(Enum(Category), primary_key=True)
+    object_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    matched_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True),
+                                                          default=lambda: datetime.datetime.now(datetime.timezone.utc))
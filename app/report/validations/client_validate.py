@@ -2,8 +2,8 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.utils import get_users
-from app.district.crud import get_districts
 from app.report.clients.schema import ClientCreate
+from app.utils.reference_data import district_names
 
 async def validate_client(db: AsyncSession, client: ClientCreate):
     if client.responsible:
@@ -12,9 +12,9 @@ async def validate_client(db: AsyncSession, client: ClientCreate):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ответственный агент не найден")
 
     if client.district:
-        districts = await get_districts(db)
+        districts = await district_names(db, *client.district)
         for district in client.district:
-            if district not in [district.name for district in districts]:
+            if district not in districts:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Район не найден")
 
     if client.budget:
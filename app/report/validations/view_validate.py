@@ -4,11 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.auth.utils import get_users
-from app.district.crud import get_districts
 from app.object.models.apartment import Apartment
 from app.object.models.commercial import Commercial
 from app.object.models.land import Land
 from app.report.views.schema import ViewCreate
+from app.utils.reference_data import district_names
 
 
 async def validate_view(db: AsyncSession, view: ViewCreate):
@@ -18,8 +18,7 @@ async def validate_view(db: AsyncSession, view: ViewCreate):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ответственный агент не найден")
 
     if view.district:
-        districts = await get_districts(db)
-        if view.district not in [district.name for district in districts]:
+        if view.district not in await district_names(db, view.district):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Район не найден")
 
     if view.price:
@@ -44,7 +43,7 @@ async def validate_view(db: AsyncSession, view: ViewCreate):
             'L': Land
         }
         table_obj = table_mapping.get(view.crm_id[0])
-        res = await db.execute(select(table_obj).filter_by(id=int(view.crm_id[1:])))
+        res = await db.execute(select(table_obj).filter_by(crm_id=view.crm_id))
         obj = res.scalars().first()
         if not obj:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Объект не найден")
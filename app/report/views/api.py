@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.schema import UserRead
 from app.auth.utils import get_current_active_user
 from app.database import get_async_session
+from app.utils.serialization import ORJSONResponse
 from app.object.models import ActionType
 
 from app.report.views.crud import create_view, get_views, get_view, update_view, delete_view
@@ -32,7 +33,7 @@ async def get_views_endpoint(
     page: int = 1,
     db: AsyncSession = Depends(get_async_session),
 ):
-    return await get_views(db, action_type, limit, page)
+    return ORJSONResponse(await get_views(db, action_type, limit, page))
 
 
 @router.get("/{view_id}", response_model=ViewResponse)
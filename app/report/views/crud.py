@@ -18,7 +18,7 @@ async def create_view(db: AsyncSession, view: ViewCreate, bg_tasks: BackgroundTa
     await validate_view(db, view)
 
     if view.crm_id[0] == 'A':
-        res = await db.execute(select(Apartment).filter_by(id=int(view.crm_id[1:])))
+        res = await db.execute(select(Apartment).filter_by(crm_id=view.crm_id))
         obj = res.scalars().first()
         if obj:
             view.owner_number = obj.phone_number
@@ -29,7 +29,7 @@ async def create_view(db: AsyncSession, view: ViewCreate, bg_tasks: BackgroundTa
         'L': Land
     }
     table_obj = table_mapping.get(view.crm_id[0])
-    res = await db.execute(select(table_obj).filter_by(id=int(view.crm_id[1:])))
+    res = await db.execute(select(table_obj).filter_by(crm_id=view.crm_id))
     obj = res.scalars().first()
     if not obj:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Объект не найден")
@@ -85,7 +85,7 @@ async def update_view(db: AsyncSession, view_id: int, view: ViewUpdate, current_
     await validate_view(db, view)
 
     if view.crm_id[0] == 'A':
-        res = await db.execute(select(Apartment).filter_by(id=int(view.crm_id[1:])))
+        res = await db.execute(select(Apartment).filter_by(crm_id=view.crm_id))
         obj = res.scalars().first()
         if obj:
             view.owner_number = obj.phone_number
@@ -96,7 +96,7 @@ async def update_view(db: AsyncSession, view_id: int, view: ViewUpdate, current_
         'L': Land
     }
     table_obj = table_mapping.get(view.crm_id[0])
-    res = await db.execute(select(table_obj).filter_by(id=int(view.crm_id[1:])))
+    res = await db.execute(select(table_obj).filter_by(crm_id=view.crm_id))
     obj = res.scalars().first()
     if not obj:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Объект не найден")
@@ -0,0 +1,51 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.schema import UserRead
+from app.auth.utils import get_current_active_user
+from app.config import SEARCH_MAX_LIMIT
+from app.database import get_async_session
+from app.saved_search.crud import create_saved_search, get_saved_searches, get_new_objects, delete_saved_search
+from app.saved_search.schema import SavedSearchCreate, SavedSearchResponse
+from app.utils.serialization import ORJSONResponse
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SavedSearchResponse)
+async def create_saved_search_endpoint(
+    saved_search: SavedSearchCreate,
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_async_session),
+):
+    return await create_saved_search(db, saved_search, current_user)
+
+
+@router.get("/", response_model=list[SavedSearchResponse])
+async def get_saved_searches_endpoint(
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_async_session),
+):
+    return await get_saved_searches(db, current_user)
+
+
+@router.get("/{saved_search_id}/new")
+async def get_new_objects_endpoint(
+    saved_search_id: int,
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    limit: int = Query(100, ge=1, le=SEARCH_MAX_LIMIT, title="Limit", description="Limit of objects to get"),
+    cursor: str = Query(None, title="Cursor", description="next_cursor from the previous response"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    return ORJSONResponse(await get_new_objects(db, saved_search_id, current_user, limit, cursor))
+
+
+@router.delete("/{saved_search_id}")
+async def delete_saved_search_endpoint(
+    saved_search_id: int,
+    current_user: Annotated[UserRead, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_async_session),
+):
+    return await delete_saved_search(db, saved_search_id, current_user)
@@ -0,0 +1,91 @@
+import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.additional.filter import filter_objects, filter_statement
+from app.config import SAVED_SEARCH_OVERLAP
+from app.saved_search.model import SavedSearch
+from app.saved_search.schema import SavedSearchCreate, SavedSearchFilters
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+async def create_saved_search(db: AsyncSession, saved_search: SavedSearchCreate, current_user):
+    if saved_search.table not in ("land", "apartment", "commercial", "all"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Неверное имя таблицы")
+    # Builds the query once so filters it would reject on every run are refused up front
+    filter_statement(table=saved_search.table, **saved_search.filters.model_dump(exclude_none=True))
+
+    try:
+        db_saved_search = SavedSearch(
+            user_id=current_user.id,
+            name=saved_search.name,
+            table=saved_search.table,
+            filters=saved_search.filters.model_dump(mode='json', exclude_none=True),
+        )
+        db.add(db_saved_search)
+        await db.commit()
+        await db.refresh(db_saved_search)
+        return db_saved_search
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+async def get_saved_searches(db: AsyncSession, current_user):
+    res = await db.execute(select(SavedSearch).filter_by(user_id=current_user.id).order_by(SavedSearch.id.desc()))
+    return res.scalars().all()
+
+
+async def get_saved_search(db: AsyncSession, saved_search_id: int, current_user):
+    res = await db.execute(select(SavedSearch).filter_by(id=saved_search_id, user_id=current_user.id))
+    saved_search = res.scalars().first()
+
+    if not saved_search:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Сохраненный поиск не найден")
+
+    return saved_search
+
+
+async def get_new_objects(db: AsyncSession, saved_search_id: int, current_user, limit: int = 100,
+                          cursor: Optional[str] = None):
+    db_saved_search = await get_saved_search(db, saved_search_id, current_user)
+    filters = SavedSearchFilters(**db_saved_search.filters)
+
+    if cursor:
+        # Later pages of a run keep its window and don't move last_run_at
+        since, page_cursor = decode_cursor(cursor, "since", "cursor")
+        try:
+            since = datetime.datetime.fromisoformat(since)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    else:
+        # A row committed late by a slow transaction can carry an updated_at older than the previous run.
+        # The overlap checks those again, at the cost of sometimes returning an object twice
+        since = db_saved_search.last_run_at - datetime.timedelta(seconds=SAVED_SEARCH_OVERLAP)
+        page_cursor = None
+
+    # Taken before the query so that objects changed while it runs are returned by the next run
+    run_at = datetime.datetime.now(datetime.timezone.utc)
+    result = await filter_objects(db, table=db_saved_search.table, updated_after=since, limit=limit,
+                                  cursor=page_cursor, **filters.model_dump(exclude_none=True))
+
+    if not cursor:
+        db_saved_search.last_run_at = run_at
+        await db.commit()
+
+    next_cursor = encode_cursor(since=since.isoformat(), cursor=result["next_cursor"]) if result["next_cursor"] else None
+    return {**result, "next_cursor": next_cursor, "since": since}
+
+
+async def delete_saved_search(db: AsyncSession, saved_search_id: int, current_user):
+    db_saved_search = await get_saved_search(db, saved_search_id, current_user)
+    try:
+        await db.delete(db_saved_search)
+        await db.commit()
+        return {"message": "Сохраненный поиск удален"}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
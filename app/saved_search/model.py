@@ -0,0 +1,25 @@
+import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, String, TIMESTAMP, JSON, ForeignKey
+
+from app.database import Base
+
+
+class SavedSearch(Base):
+    __tablename__ = 'saved_search'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    name: Mapped[str] = mapped_column(String(length=255))
+    table: Mapped[str] = mapped_column(String(length=20))
+    filters: Mapped[dict] = mapped_column(JSON, default={})
+    # Objects updated after this moment are what the next "new" run returns
+    last_run_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True),
+                                                           default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    created_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True),
+                                                          default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    updated_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True),
+                                                          default=lambda: datetime.datetime.now(datetime.timezone.utc),
+                                                          onupdate=lambda: datetime.datetime.now(datetime.timezone.utc))
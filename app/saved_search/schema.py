@@ -0,0 +1,58 @@
+import datetime
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.object.models import ActionType, HouseType, BathroomType, CurrentStatus, HouseCondition, LocationCommercial, \
+    LocationLand
+
+
+class SavedSearchFilters(BaseModel):
+    action_type: Optional[list[ActionType]] = None
+    district: Optional[list[str]] = None
+    metro_st: Optional[list[str]] = None
+    furniture: Optional[bool] = None
+    bathroom: Optional[list[BathroomType]] = None
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    room_min: Optional[int] = None
+    room_max: Optional[int] = None
+    area_min: Optional[int] = None
+    area_max: Optional[int] = None
+    floor_min: Optional[int] = None
+    floor_max: Optional[int] = None
+    date_min: Optional[str] = None
+    date_max: Optional[str] = None
+    current_status: Optional[list[CurrentStatus]] = None
+    status_date_min: Optional[str] = None
+    status_date_max: Optional[str] = None
+    house_type: Optional[list[HouseType]] = None
+    house_condition: Optional[list[HouseCondition]] = None
+    location_commercial: Optional[list[LocationCommercial]] = None
+    location_land: Optional[list[LocationLand]] = None
+    parking_place: Optional[bool] = None
+    responsible: Optional[list[str]] = None
+
+    class Config:
+        extra = 'forbid'
+
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255, description="The name of the saved search",
+                      examples=["2-room Chilanzar rent"])
+    table: str = Field(..., description="Table name to filter", examples=["land", "apartment", "commercial", "all"])
+    filters: SavedSearchFilters = Field(..., description="The same filters as /additional/filter/",
+                                        examples=[{"action_type": ["rent"], "district": ["Chilanzar", "Yunusabad"],
+                                                   "room_min": 2, "room_max": 2, "price_max": 60000}])
+
+
+class SavedSearchResponse(SavedSearchCreate):
+    id: int = Field(..., description="The ID of the saved search", examples=[1])
+    user_id: int = Field(..., description="The ID of the owner", examples=[1])
+    last_run_at: datetime.datetime = Field(..., description="Objects updated after this time are new",
+                                           examples=["2021-08-01T12:00:00"])
+    created_at: datetime.datetime = Field(..., description="The time the saved search was created",
+                                          examples=["2021-08-01T12:00:00"])
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,39 @@
+from typing import Callable, Type
+
+from sqlalchemy.event import listens_for
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.session import Session
+
+# Changed rows are queued in session.info under their key and handed to the key's handler once the
+# transaction commits, so in-memory caches and indexes never see rows that are rolled back
+_handlers: dict[str, Callable[[list], None]] = {}
+
+
+def track_changes(model: Type, key: str, change: Callable, apply: Callable[[list], None]):
+    # change(target, deleted) returns what is queued for a flushed row, apply(changes) gets the queue on commit
+    _handlers[key] = apply
+
+    def queue_change(deleted: bool):
+        def receive(mapper, connection, target):
+            session = AsyncSession.object_session(target)
+            if session:
+                session.info.setdefault(key, []).append(change(target, deleted))
+        return receive
+
+    listens_for(model, 'after_insert')(queue_change(False))
+    listens_for(model, 'after_update')(queue_change(False))
+    listens_for(model, 'after_delete')(queue_change(True))
+
+
+@listens_for(Session, 'after_commit')
+def apply_after_commit(session):
+    for key, apply in _handlers.items():
+        changes = session.info.pop(key, None)
+        if changes:
+            apply(changes)
+
+
+@listens_for(Session, 'after_rollback')
+def discard_after_rollback(session):
+    for key in _handlers:
+        session.info.pop(key, None)
@@ -1,8 +1,17 @@
+import asyncio
+import logging
+import os
+import shutil
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import UploadFile
 from pathlib import Path
 
+from app.config import MEDIA_CHUNK
+
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 if not (BASE_DIR / "storage").exists():
@@ -12,10 +21,19 @@ if not (BASE_DIR / "storage").exists():
     (BASE_DIR / "storage" / "commercial").mkdir()
 
 MEDIA_DIR = BASE_DIR / "storage"
+# Uploads are written here first and moved into place only after their media rows are committed.
+# It is inside the media root, so the move is a rename even when storage is a separate mount
+STAGING_DIR = MEDIA_DIR / ".staging"
+
 
+def copy_file(source, destination: str):
+    with open(destination, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, MEDIA_CHUNK)
 
-def save_upload_file(upload_file: [UploadFile], object_id, category,
-                     last_media: Optional[int] = None) -> [dict]:
+
+async def save_upload_file(upload_file: [UploadFile], object_id, category,
+                           last_media: Optional[int] = None) -> [dict]:
+    STAGING_DIR.mkdir(exist_ok=True)
     urls = []
     counter = int(last_media)+1 if last_media else 1
     for file in upload_file:
@@ -28,10 +46,32 @@ def save_upload_file(upload_file: [UploadFile], object_id, category,
         file_location = f"{MEDIA_DIR}/{category}/{filename}_{object_id}_{counter}.{file_extension}"
         url = f"storage/{category}/{filename}_{object_id}_{counter}.{file_extension}"
 
-        with open(file_location, "wb") as buffer:
-            buffer.write(file.file.read())
-
-        urls.append({"url": url, "media_type": media_type})
+        staged_location = f"{STAGING_DIR}/{uuid4().hex}.{file_extension}"
+        urls.append({"url": url, "media_type": media_type, "staged": staged_location, "location": file_location})
         counter += 1
 
+    # Files are copied chunk by chunk in worker threads, all of them at once, so a large video
+    # neither blocks the event loop nor is held in memory whole
+    results = await asyncio.gather(*[asyncio.to_thread(copy_file, file.file, url["staged"])
+                                     for file, url in zip(upload_file, urls)], return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        discard_files(urls)
+        raise errors[0]
+
     return urls
+
+
+def publish_files(urls: [dict]):
+    # Called after the commit: a file that can't be moved stays in staging for a manual retry, its row is kept
+    for url in urls:
+        try:
+            os.replace(url["staged"], url["location"])
+        except OSError as e:
+            logger.error(f"Failed to move {url['staged']} to {url['location']}: {e}")
+
+
+def discard_files(urls: [dict]):
+    for url in urls:
+        if os.path.exists(url["staged"]):
+            os.remove(url["staged"])
@@ -0,0 +1,17 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(**keys) -> str:
+    payload = json.dumps(keys, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *keys: str) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return tuple(payload[key] for key in keys)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
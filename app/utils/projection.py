@@ -0,0 +1,21 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+# Columns every projected row keeps: the identity and the keys list endpoints paginate by
+REQUIRED_FIELDS = ('id', 'crm_id', 'created_at')
+CARD_FIELDS = REQUIRED_FIELDS + ('title', 'category', 'action_type', 'district', 'price', 'rooms', 'square_area',
+                                 'current_status')
+
+
+def projection(columns, fields: Optional[list[str]]) -> Optional[list]:
+    if not fields:
+        return None
+    if fields == ['card']:
+        fields = CARD_FIELDS
+
+    names = list(dict.fromkeys([*REQUIRED_FIELDS, *fields]))
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid fields: {', '.join(unknown)}")
+    return [columns[name] for name in names]
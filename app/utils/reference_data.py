@@ -0,0 +1,52 @@
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import REFERENCE_DATA_TTL
+from app.database import async_session_maker
+from app.district.model import District
+from app.metro.model import Metro
+
+# District and metro names checked by every object, client and view validation. The district and metro CRUD
+# invalidate them on change. Another worker process may have added a name since the last load, so a name that is
+# missing is looked up once more before the caller rejects it; the TTL covers renames and deletions
+_districts: set[str] = set()
+_metros: set[str] = set()
+_loaded_at = None
+
+
+async def load_reference_data(db: AsyncSession = None):
+    global _districts, _metros, _loaded_at
+
+    if db is None:
+        async with async_session_maker() as session:
+            return await load_reference_data(session)
+
+    _districts = set(await db.scalars(select(District.name)))
+    _metros = set(await db.scalars(select(Metro.name)))
+    _loaded_at = time.monotonic()
+
+
+def invalidate_reference_data():
+    global _loaded_at
+    _loaded_at = None
+
+
+async def ensure_loaded(db: AsyncSession, loaded: Callable[[], set[str]], names: tuple[Optional[str], ...]):
+    if _loaded_at is None or time.monotonic() - _loaded_at > REFERENCE_DATA_TTL:
+        await load_reference_data(db)
+    elif not {name for name in names if name} <= loaded():
+        await load_reference_data(db)
+
+
+async def district_names(db: AsyncSession, *names: Optional[str]) -> set[str]:
+    # names: the ones about to be checked, reloaded for if any is missing
+    await ensure_loaded(db, lambda: _districts, names)
+    return _districts
+
+
+async def metro_names(db: AsyncSession, *names: Optional[str]) -> set[str]:
+    await ensure_loaded(db, lambda: _metros, names)
+    return _metros
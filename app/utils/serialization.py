@@ -0,0 +1,52 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+
+@lru_cache
+def mapped_keys(model: type) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    mapper = inspect(model)
+    return tuple(attr.key for attr in mapper.column_attrs), tuple(mapper.relationships.keys())
+
+
+def columns_to_dict(obj) -> dict:
+    # Only what is already loaded, so serializing never triggers a lazy load
+    loaded = obj.__dict__
+    return {key: loaded[key] for key in mapped_keys(type(obj))[0] if key in loaded}
+
+
+def orm_to_dict(obj) -> dict:
+    # Related objects are written one level deep, without their own relationships, e.g. media without its parent
+    data = columns_to_dict(obj)
+    loaded = obj.__dict__
+    for key in mapped_keys(type(obj))[1]:
+        if key in loaded:
+            value = loaded[key]
+            if value is None:
+                data[key] = None
+            elif isinstance(value, list):
+                data[key] = [columns_to_dict(item) for item in value]
+            else:
+                data[key] = columns_to_dict(value)
+    return data
+
+
+def encode_default(obj: Any):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if hasattr(obj, '__mapper__'):
+        return orm_to_dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Writes ORM objects, row mappings and pydantic models straight to JSON bytes, skipping jsonable_encoder
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=encode_default)
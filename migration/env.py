@@ -19,6 +19,8 @@ from app.changes.model import ChangeLog, OperationType
 from app.report.clients.model import Client, ClientStatus, DealStatus
 from app.report.views.model import View
 from app.report.deals.model import Deal
+from app.saved_search.model import SavedSearch
+from app.report.matching.model import ClientMatch
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,39 @@
+"""create client match
+
+Revision ID: a3d8e61f5c20
+Revises: f7a2c9e31d6b
+Create Date: 2025-02-24 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8e61f5c20'
+down_revision: Union[str, None] = 'f7a2c9e31d6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('client_match',
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('category', postgresql.ENUM('APARTMENT', 'LAND', 'COMMERCIAL', name='category', create_type=False),
+              nullable=False),
+    sa.Column('object_id', sa.Integer(), nullable=False),
+    sa.Column('matched_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['client.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('client_id', 'category', 'object_id')
+    )
+    op.create_index('ix_client_match_category_object_id', 'client_match', ['category', 'object_id'], unique=False)
+    op.create_index('ix_client_updated_at', 'client', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_client_updated_at', table_name='client')
+    op.drop_index('ix_client_match_category_object_id', table_name='client_match')
+    op.drop_table('client_match')
@@ -0,0 +1,43 @@
+"""add filter indexes to objects
+
+Revision ID: b7e4c2a91f3d
+Revises: 41dcd41a78fa
+Create Date: 2025-02-10 12:14:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2a91f3d'
+down_revision: Union[str, None] = '41dcd41a78fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tables = ['apartment', 'land', 'commercial']
+
+
+def upgrade() -> None:
+    for table in tables:
+        op.create_index(f'ix_{table}_action_type_district_price', table,
+                        ['action_type', 'district', 'price'], unique=False)
+        op.create_index(f'ix_{table}_action_type_rooms_square_area', table,
+                        ['action_type', 'rooms', 'square_area'], unique=False)
+        op.create_index(f'ix_{table}_responsible_created_at', table,
+                        ['responsible', 'created_at'], unique=False)
+        op.create_index(f'ix_{table}_created_at', table, ['created_at'], unique=False)
+        op.create_index(f'ix_{table}_current_status_status_date', table,
+                        ['current_status', 'status_date'], unique=False,
+                        postgresql_where=sa.text('current_status IS NOT NULL'))
+
+
+def downgrade() -> None:
+    for table in reversed(tables):
+        op.drop_index(f'ix_{table}_current_status_status_date', table_name=table)
+        op.drop_index(f'ix_{table}_created_at', table_name=table)
+        op.drop_index(f'ix_{table}_responsible_created_at', table_name=table)
+        op.drop_index(f'ix_{table}_action_type_rooms_square_area', table_name=table)
+        op.drop_index(f'ix_{table}_action_type_district_price', table_name=table)
@@ -0,0 +1,35 @@
+"""crm id sequences
+
+Revision ID: b81f4d2c7e93
+Revises: a3d8e61f5c20
+Create Date: 2025-03-03 09:41:15.672418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4d2c7e93'
+down_revision: Union[str, None] = 'a3d8e61f5c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tables = {'apartment': 'A', 'land': 'L', 'commercial': 'C'}
+
+
+def upgrade() -> None:
+    for table, letter in tables.items():
+        op.execute(f"CREATE SEQUENCE {table}_crm_id_seq")
+        # Continue after both the numbers already handed out and the ids they were derived from
+        op.execute(f"SELECT setval('{table}_crm_id_seq', greatest("
+                   f"(SELECT max(substring(crm_id FROM '^{letter}(\\d+)$')::bigint) FROM {table}), "
+                   f"(SELECT max(id) FROM {table}), 0) + 1, false)")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN crm_id SET DEFAULT '{letter}' || nextval('{table}_crm_id_seq')")
+
+
+def downgrade() -> None:
+    for table in reversed(tables):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN crm_id DROP DEFAULT")
+        op.execute(f"DROP SEQUENCE {table}_crm_id_seq")
@@ -0,0 +1,40 @@
+"""add search_vector to objects
+
+Revision ID: d3a8f61c0b27
+Revises: b7e4c2a91f3d
+Create Date: 2025-02-12 10:41:05.226813
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f61c0b27'
+down_revision: Union[str, None] = 'b7e4c2a91f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tables = ['apartment', 'land', 'commercial']
+
+search_vector = ("setweight(to_tsvector('simple', coalesce(crm_id, '') || ' ' || coalesce(title, '')), 'A') || "
+                 "setweight(to_tsvector('simple', coalesce(district, '')), 'B') || "
+                 "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+                 "setweight(to_tsvector('simple', coalesce(comment, '')), 'D')")
+
+
+def upgrade() -> None:
+    for table in tables:
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(),
+                                       sa.Computed(search_vector, persisted=True), nullable=True))
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False,
+                        postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in reversed(tables):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin')
+        op.drop_column(table, 'search_vector')
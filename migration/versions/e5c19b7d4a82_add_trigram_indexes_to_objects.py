@@ -0,0 +1,38 @@
+"""add trigram indexes to objects
+
+Revision ID: e5c19b7d4a82
+Revises: d3a8f61c0b27
+Create Date: 2025-02-13 16:02:48.913540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c19b7d4a82'
+down_revision: Union[str, None] = 'd3a8f61c0b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tables = ['apartment', 'land', 'commercial']
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in tables:
+        op.create_index(f'ix_{table}_title_trgm', table, ['title'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+        op.create_index(f'ix_{table}_crm_id_trgm', table, ['crm_id'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'crm_id': 'gin_trgm_ops'})
+        op.create_index(f'ix_{table}_crm_id_prefix', table, ['crm_id'], unique=False,
+                        postgresql_ops={'crm_id': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    for table in reversed(tables):
+        op.drop_index(f'ix_{table}_crm_id_prefix', table_name=table)
+        op.drop_index(f'ix_{table}_crm_id_trgm', table_name=table, postgresql_using='gin')
+        op.drop_index(f'ix_{table}_title_trgm', table_name=table, postgresql_using='gin')
@@ -0,0 +1,49 @@
+"""create saved search and updated_at indexes
+
+Revision ID: f7a2c9e31d6b
+Revises: e5c19b7d4a82
+Create Date: 2025-02-17 11:24:07.305816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2c9e31d6b'
+down_revision: Union[str, None] = 'e5c19b7d4a82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tables = ['apartment', 'land', 'commercial']
+
+
+def upgrade() -> None:
+    op.create_table('saved_search',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('table', sa.String(length=20), nullable=False),
+    sa.Column('filters', sa.JSON(), nullable=False),
+    sa.Column('last_run_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_saved_search_id'), 'saved_search', ['id'], unique=False)
+    op.create_index(op.f('ix_saved_search_user_id'), 'saved_search', ['user_id'], unique=False)
+
+    for table in tables:
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(tables):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+
+    op.drop_index(op.f('ix_saved_search_user_id'), table_name='saved_search')
+    op.drop_index(op.f('ix_saved_search_id'), table_name='saved_search')
+    op.drop_table('saved_search')
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import types
+
+import pytest
+
+# The tests create and drop every table, so they never run against the database from .env
+os.environ["DB_NAME"] = os.getenv("TEST_DB_NAME", "crm_test")
+
+from fastapi import UploadFile  # noqa: E402
+from starlette.datastructures import Headers  # noqa: E402
+
+import app.main  # noqa: E402,F401  imports every model, so create_all builds the full schema
+from app.changes.track_models import register_event_listeners  # noqa: E402
+from app.database import Base, async_session_maker, create_db_and_tables, engine  # noqa: E402
+from app.district.model import District  # noqa: E402
+from app.object.models import ActionType, BathroomType, Category, CurrentStatus, HouseCondition, \
+    HouseType  # noqa: E402
+from app.object.schemas.apartment import ApartmentCreate  # noqa: E402
+from app.utils.file_utils import BASE_DIR  # noqa: E402
+from app.utils.reference_data import load_reference_data  # noqa: E402
+
+# As the lifespan does, so the change log and the in-memory indexes see the writes the tests make
+register_event_listeners()
+
+DISTRICT = "Yunusabad"
+JPEG = b'\xff\xd8\xff\xe0' + b'\x00' * 64
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def database():
+    try:
+        async with engine.connect():
+            pass
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL test database is not available: {e}")
+
+    await create_db_and_tables()
+
+    async with async_session_maker() as session:
+        session.add(District(name=DISTRICT))
+        await session.commit()
+    # Loaded up front, so validation issues no queries inside the statements being counted
+    await load_reference_data()
+
+    yield
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    # Every test runs in its own event loop, pooled connections can't outlive it
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(database):
+    async with async_session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+def current_user():
+    return types.SimpleNamespace(id=1, full_name="Test Agent", phone="+998901234567", is_superuser=True)
+
+
+@pytest.fixture
+def saved_media():
+    # Media published by the tests, removed from storage afterwards
+    urls = []
+    yield urls
+    for url in urls:
+        path = BASE_DIR / url
+        if path.exists():
+            path.unlink()
+
+
+def apartment_create(**fields) -> ApartmentCreate:
+    return ApartmentCreate(**{
+        "district": DISTRICT,
+        "title": "Apartment for sale",
+        "category": Category.APARTMENT,
+        "action_type": ActionType.SALE,
+        "price": 100000,
+        "house_type": HouseType.NEW_BUILDING,
+        "rooms": 2,
+        "square_area": 60,
+        "floor_number": 9,
+        "floor": 3,
+        "bathroom": BathroomType.SEPERATED,
+        "house_condition": HouseCondition.EURO,
+        "current_status": CurrentStatus.FREE,
+        "name": "John Doe",
+        "phone_number": "+998901234567",
+        "agent_percent": 10,
+        **fields,
+    })
+
+
+def image_uploads(count: int, size: int = len(JPEG)) -> list[UploadFile]:
+    uploads = []
+    for number in range(count):
+        # Spooled to disk past 1 MB, as Starlette does with the files of a multipart request
+        file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        file.write(JPEG.ljust(size, b'\x00'))
+        file.seek(0)
+        uploads.append(UploadFile(file, filename=f"photo{number}.jpg", headers=Headers({"content-type": "image/jpeg"})))
+    return uploads
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy.future import select
+
+from app.changes.funcs import log_change, log_queue
+from app.changes.model import ChangeLog, OperationType
+from app.object.functions.apartment import create_apartment, update_apartment
+from app.object.schemas.apartment import ApartmentUpdate
+from conftest import apartment_create
+
+pytestmark = pytest.mark.anyio
+
+
+async def queued_changes() -> list[tuple]:
+    # The listeners hand their entries to the queue from tasks; let them run first
+    for _ in range(5):
+        await asyncio.sleep(0)
+    changes = []
+    while not log_queue.empty():
+        changes.append(log_queue.get_nowait())
+        log_queue.task_done()
+    return changes
+
+
+async def test_update_writes_change_log(db, current_user, capsys):
+    apartment = await create_apartment(current_user, db, apartment_create(), None, BackgroundTasks())
+    await queued_changes()
+
+    update = apartment_create(price=120000).model_dump(exclude={'crm_id', 'responsible'})
+    await update_apartment(db, apartment.id, ApartmentUpdate(**update), current_user, None, BackgroundTasks())
+
+    updates = [change for change in await queued_changes() if change[1] == OperationType.UPDATE]
+    assert len(updates) == 1
+    for change in updates:
+        await log_change(db, *change)
+
+    result = await db.execute(select(ChangeLog).filter_by(table_name='apartment', operation=OperationType.UPDATE))
+    change_log = result.scalars().one()
+    assert change_log.before_data["price"] == 100000
+    assert change_log.after_data["price"] == 120000
+    assert "Error capturing original value" not in capsys.readouterr().out
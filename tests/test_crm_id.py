@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import text
+
+from app.auth.model import User
+from app.database import async_session_maker
+from app.object.functions.apartment import create_apartment
+from app.object.models import ActionType
+from app.report.views.crud import create_view
+from app.report.views.schema import ViewCreate
+from conftest import apartment_create
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENT_CREATES = 12
+
+
+async def create_in_own_session(current_user):
+    async with async_session_maker() as session:
+        apartment = await create_apartment(current_user, session, apartment_create(), None, BackgroundTasks())
+        return apartment.crm_id
+
+
+async def test_parallel_creates_get_distinct_crm_ids(database, current_user):
+    crm_ids = await asyncio.gather(*[create_in_own_session(current_user) for _ in range(CONCURRENT_CREATES)])
+
+    assert len(set(crm_ids)) == CONCURRENT_CREATES
+    assert all(crm_id.startswith('A') and crm_id[1:].isdigit() for crm_id in crm_ids)
+
+
+async def test_view_finds_object_by_crm_id(db, current_user):
+    # Migrated databases start the sequence past the ids already taken, so crm_id and id can differ
+    await db.execute(text("SELECT setval('apartment_crm_id_seq', 500)"))
+    db.add(User(phone=current_user.phone, email="agent@example.com", full_name=current_user.full_name,
+                hashed_password="-"))
+    await db.commit()
+    apartment = await create_apartment(current_user, db, apartment_create(), None, BackgroundTasks())
+    assert apartment.crm_id != f"A{apartment.id}"
+
+    view = await create_view(db, ViewCreate(action_type=ActionType.SALE, responsible=current_user.full_name,
+                                            date="2024-01-01", time="12:00", price=100000, agent_percent=10,
+                                            crm_id=apartment.crm_id))
+
+    assert view.crm_id == apartment.crm_id
+    assert view.owner_number == apartment.phone_number
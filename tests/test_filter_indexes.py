@@ -0,0 +1,75 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql
+
+from app.additional.filter import filter_statement
+from app.object.models import ActionType
+from app.object.models.apartment import Apartment
+from conftest import apartment_create
+
+pytestmark = pytest.mark.anyio
+
+SEEDED_ROWS = 20000
+DISTRICTS = [f"District {number}" for number in range(50)]
+RESPONSIBLE = [f"Agent {number}" for number in range(40)]
+
+FILTER_CASES = [
+    ("ix_apartment_action_type_district_price",
+     {"action_type": [ActionType.SALE], "district": ["District 7"], "price_min": 100000, "price_max": 150000}),
+    ("ix_apartment_action_type_rooms_square_area",
+     {"action_type": [ActionType.RENT], "room_min": 2, "room_max": 2, "area_min": 50, "area_max": 60}),
+]
+
+
+@pytest.fixture
+async def seeded_db(db):
+    random.seed(1)
+    base = apartment_create().model_dump(exclude={'crm_id'})
+    rows = [{**base, "action_type": random.choice(list(ActionType)), "district": random.choice(DISTRICTS),
+             "price": random.randrange(10000, 500000, 100), "rooms": random.randint(1, 6),
+             "square_area": random.randint(20, 200), "responsible": random.choice(RESPONSIBLE)}
+            for _ in range(SEEDED_ROWS)]
+    await db.execute(insert(Apartment), rows)
+    await db.commit()
+    await db.execute(text("ANALYZE apartment"))
+    await db.commit()
+    return db
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(db, stmt) -> dict:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    conn = await db.connection()
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+def buffers(plan: dict) -> int:
+    return plan["Plan"]["Shared Hit Blocks"] + plan["Plan"]["Shared Read Blocks"]
+
+
+@pytest.mark.parametrize("index_name, filters", FILTER_CASES)
+async def test_filter_uses_composite_index(seeded_db, index_name, filters):
+    stmt = filter_statement(table='apartment', **filters)[0]
+
+    # Before: the same query with the index dropped, inside a transaction that is rolled back
+    await seeded_db.execute(text(f"DROP INDEX {index_name}"))
+    before = await explain(seeded_db, stmt)
+    await seeded_db.rollback()
+
+    after = await explain(seeded_db, stmt)
+
+    print(f"\n{index_name}: {before['Execution Time']:.2f} ms, {buffers(before)} buffers without the index, "
+          f"{after['Execution Time']:.2f} ms, {buffers(after)} buffers with it")
+    assert index_name not in {node.get("Index Name") for node in plan_nodes(before["Plan"])}
+    assert index_name in {node.get("Index Name") for node in plan_nodes(after["Plan"])}
+    assert "Seq Scan" not in {node["Node Type"] for node in plan_nodes(after["Plan"])}
+    assert buffers(after) < buffers(before)
@@ -0,0 +1,17 @@
+import pytest
+
+from app.district.model import District
+from app.object.functions.validations.validate_apartment import validate_apartment
+from app.utils.reference_data import district_names
+from conftest import apartment_create
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_district_added_by_another_worker_is_accepted(db):
+    # Added without the district CRUD, so this process's cache is not invalidated, as for a change in another worker
+    db.add(District(name="Chilanzar"))
+    await db.commit()
+
+    await validate_apartment(db, apartment_create(district="Chilanzar"))
+    assert "Chilanzar" in await district_names(db)
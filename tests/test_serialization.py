@@ -0,0 +1,56 @@
+import datetime
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.object.models.apartment import Apartment, ApartmentMedia
+from app.utils.serialization import ORJSONResponse
+from conftest import apartment_create
+
+PAGE_SIZE = 100
+MEDIA_PER_OBJECT = 3
+BENCHMARK_SECONDS = 1.0
+
+
+def apartment_page() -> dict:
+    # Built as a page loaded with selectinload: columns and media set as loaded, no session involved
+    now = datetime.datetime.now(datetime.timezone.utc)
+    fields = apartment_create().model_dump(exclude={'crm_id'})
+    apartments = []
+    for number in range(1, PAGE_SIZE + 1):
+        apartment = Apartment(**fields, id=number, crm_id=f"A{number}", created_at=now, updated_at=now)
+        set_committed_value(apartment, 'media', [
+            ApartmentMedia(id=number * MEDIA_PER_OBJECT + index, url=f"media/apartment/{number}_{index}.jpg",
+                           media_type="image", apartment_id=number, created_at=now, updated_at=now)
+            for index in range(MEDIA_PER_OBJECT)])
+        apartments.append(apartment)
+    return {"data": apartments, "total_count": PAGE_SIZE}
+
+
+def pages_per_second(render) -> float:
+    rendered = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < BENCHMARK_SECONDS:
+        render()
+        rendered += 1
+    return rendered / elapsed
+
+
+def test_orjson_response_throughput():
+    page = apartment_page()
+
+    def baseline():
+        return JSONResponse(jsonable_encoder(page)).body
+
+    def orjson():
+        return ORJSONResponse(page).body
+
+    assert json.loads(orjson()) == json.loads(baseline())
+
+    before, after = pages_per_second(baseline), pages_per_second(orjson)
+    print(f"\n{PAGE_SIZE} apartments with {MEDIA_PER_OBJECT} media: {before:.0f} pages/s with jsonable_encoder, "
+          f"{after:.0f} pages/s with orjson")
+    assert after > before
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import event
+
+from app.database import engine
+from app.object.functions.apartment import create_apartment, get_apartment, get_apartments, update_apartment
+from app.object.schemas.apartment import ApartmentUpdate
+from conftest import apartment_create, image_uploads
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+    yield executed
+    event.remove(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+
+def media_inserts(executed: list[str]) -> list[str]:
+    return [statement for statement in executed if statement.startswith('INSERT INTO apartment_media')]
+
+
+async def test_create_inserts_media_in_one_statement(db, current_user, statements, saved_media):
+    apartment = await create_apartment(current_user, db, apartment_create(), image_uploads(3), BackgroundTasks())
+    saved_media.extend(media.url for media in apartment.media)
+
+    assert len(apartment.media) == 3
+    assert len(media_inserts(statements)) == 1
+    # The object INSERT and the batched media INSERT; the response needs no SELECT
+    assert not [statement for statement in statements if statement.startswith('SELECT')]
+
+
+async def test_update_inserts_media_in_one_statement(db, current_user, statements, saved_media):
+    apartment = await create_apartment(current_user, db, apartment_create(), None, BackgroundTasks())
+    statements.clear()
+
+    apartment = await update_apartment(db, apartment.id, ApartmentUpdate(**apartment_create().model_dump(
+        exclude={'crm_id', 'responsible'})), current_user, image_uploads(3), BackgroundTasks())
+    saved_media.extend(media.url for media in apartment.media)
+
+    assert len(apartment.media) == 3
+    assert len(media_inserts(statements)) == 1
+
+
+async def test_detail_loads_media_with_one_query(db, current_user, statements):
+    apartment = await create_apartment(current_user, db, apartment_create(), None, BackgroundTasks())
+    db.expunge_all()
+    statements.clear()
+
+    await get_apartment(db, apartment.id)
+
+    # The apartment and one selectin query for its media
+    assert len(statements) == 2
+
+
+async def test_list_statement_count(db, current_user, statements):
+    for _ in range(3):
+        await create_apartment(current_user, db, apartment_create(), None, BackgroundTasks())
+    db.expunge_all()
+
+    statements.clear()
+    result = await get_apartments(db, limit=10)
+    assert len(result["data"]) == 3
+    # Count, the page and one selectin query for the media of the whole page
+    assert len(statements) == 3
+
+    statements.clear()
+    await get_apartments(db, limit=10, fields=["id", "title"])
+    # Projected rows load no media
+    assert len(statements) == 2
@@ -0,0 +1,86 @@
+import asyncio
+import itertools
+import math
+import time
+
+import pytest
+
+from app.main import app
+from app.utils.file_utils import discard_files, save_upload_file
+from conftest import image_uploads
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENT_UPLOADS = 4
+UPLOAD_SIZE = 32 * 1024 * 1024
+PROBE_INTERVAL = 0.01
+
+
+async def get(path: str) -> int:
+    # One request straight through the ASGI app, no server or database involved
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "headers": [(b"host", b"test")], "client": ("127.0.0.1", 1), "server": ("test", 80)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+def blocking_save(uploads, directory):
+    # What save_upload_file did before: each upload read whole and written on the event loop
+    for number, file in enumerate(uploads):
+        with open(directory / f"{number}.jpg", "wb") as buffer:
+            buffer.write(file.file.read())
+
+
+async def chunked_save(uploads):
+    discard_files(await save_upload_file(uploads, 1, "apartment"))
+
+
+async def p99_during(upload) -> float:
+    # Built up front, so making the test data does not block the loop while it is probed
+    requests = [image_uploads(1, UPLOAD_SIZE) for _ in range(CONCURRENT_UPLOADS)]
+    latencies = []
+    done = asyncio.Event()
+
+    async def probe():
+        # Requests arrive on a fixed schedule, and each is timed from its arrival, so the requests that
+        # arrived while the event loop was blocked count with the whole wait
+        started = time.perf_counter()
+        for number in itertools.count():
+            if done.is_set():
+                break
+            arrival = started + number * PROBE_INTERVAL
+            await asyncio.sleep(max(arrival - time.perf_counter(), 0))
+            assert await get("/openapi.json") == 200
+            latencies.append(time.perf_counter() - arrival)
+
+    async def upload_all():
+        await asyncio.sleep(PROBE_INTERVAL * 5)
+        await asyncio.gather(*[upload(uploads) for uploads in requests])
+        done.set()
+
+    await asyncio.gather(probe(), upload_all())
+    latencies.sort()
+    return latencies[math.ceil(len(latencies) * 0.99) - 1]
+
+
+async def test_uploads_do_not_stall_other_requests(tmp_path):
+    await get("/openapi.json")
+
+    async def blocking(uploads):
+        blocking_save(uploads, tmp_path)
+
+    before = await p99_during(blocking)
+    after = await p99_during(chunked_save)
+
+    print(f"\n{CONCURRENT_UPLOADS} concurrent {UPLOAD_SIZE // 2 ** 20} MB uploads: p99 of GET /openapi.json "
+          f"{before * 1000:.1f} ms with blocking writes, {after * 1000:.1f} ms with chunked writes in threads")
+    assert after < before